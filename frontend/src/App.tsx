@@ -444,10 +444,15 @@ function App() {
                       break;
                       
                     case 'progress':
-                      // 处理后端发送的进度事件
-                      if (eventData.data) {
+                    case 'progress_batch': {
+                      // 处理后端发送的进度事件（progress_batch 合并了多个 chunk）
+                      const chunks = eventData.type === 'progress_batch' ? (eventData.chunks || []) : [eventData.data];
+                      chunks.forEach((chunk: any) => {
+                        if (!chunk) {
+                          return;
+                        }
                         // 计算已完成的节点数量
-                        const completedNodeKeys = Object.keys(eventData.data);
+                        const completedNodeKeys = Object.keys(chunk);
                         if (completedNodeKeys.length > 0) {
                           newResult.completedNodes = Math.max(newResult.completedNodes, completedNodeKeys.length);
                         }
@@ -462,7 +467,7 @@ function App() {
                             startTime: eventData.timestamp,
                             endTime: eventData.timestamp,
                             duration: 0,
-                            result: eventData.data[nodeId],
+                            result: chunk[nodeId],
                             error: null,
                             logs: []
                           };
@@ -473,8 +478,9 @@ function App() {
                             newResult.nodes.push(nodeData);
                           }
                         });
-                      }
+                      });
                       break;
+                    }
                       
                     case 'complete':
                     case 'execution_completed':
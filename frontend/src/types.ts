@@ -31,8 +31,9 @@ export interface HumanInputRequired {
 }
 
 export interface StreamResponse {
-  type: 'start' | 'progress' | 'complete' | 'error' | 'human_input_required';
+  type: 'start' | 'progress' | 'progress_batch' | 'complete' | 'error' | 'human_input_required';
   data?: any;
+  chunks?: any[];
   interrupt_info?: HumanInputRequired;
   thread_id?: string;
   timestamp: string;
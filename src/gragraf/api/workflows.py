@@ -12,6 +12,7 @@ from ..domain.value_objects import WorkflowId, WorkflowStatus
 from ..domain.repositories import DuplicateWorkflowError, WorkflowConflictError
 from ..application.services import WorkflowApplicationService
 from ..infrastructure.repositories import RepositoryFactory
+from ..infrastructure.database import get_database_manager
 
 
 # Pydantic models for API
@@ -23,6 +24,10 @@ class CreateWorkflowRequest(BaseModel):
     created_by: Optional[str] = Field(None, description="Creator identifier")
 
 
+class BulkCreateWorkflowsRequest(BaseModel):
+    workflows: List[CreateWorkflowRequest] = Field(..., min_length=1, description="Workflows to create")
+
+
 class UpdateWorkflowRequest(BaseModel):
     dsl: Dict[str, Any] = Field(..., description="New workflow definition")
 
@@ -60,6 +65,10 @@ class ExecutionRecordRequest(BaseModel):
     executed_at: Optional[datetime] = Field(None, description="When execution occurred")
 
 
+class BulkExecutionRecordRequest(BaseModel):
+    executions: List[ExecutionRecordRequest] = Field(..., min_length=1, description="Execution results, in order")
+
+
 class HealthResponse(BaseModel):
     status: str
     health_score: float
@@ -72,7 +81,7 @@ class HealthResponse(BaseModel):
 # Dependency injection
 def get_workflow_service() -> WorkflowApplicationService:
     """Get workflow application service instance."""
-    from ..server import db_manager
+    db_manager = get_database_manager()
     if db_manager is None:
         raise RuntimeError("Database not initialized. Application startup may have failed.")
     factory = RepositoryFactory(db_manager)
@@ -104,6 +113,23 @@ async def create_workflow(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/bulk", response_model=List[WorkflowResponse], status_code=201)
+async def create_workflows_bulk(
+    request: BulkCreateWorkflowsRequest,
+    service: WorkflowApplicationService = Depends(get_workflow_service)
+):
+    """Create several workflows in one transaction."""
+    try:
+        workflows = await service.create_workflows(
+            [workflow.model_dump() for workflow in request.workflows]
+        )
+        return [_workflow_to_response(wf) for wf in workflows]
+    except DuplicateWorkflowError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("/{workflow_id}", response_model=WorkflowResponse)
 async def get_workflow(
     workflow_id: str,
@@ -303,6 +329,24 @@ async def record_execution(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/{workflow_id}/executions/bulk", response_model=WorkflowResponse)
+async def record_executions_bulk(
+    workflow_id: str,
+    request: BulkExecutionRecordRequest,
+    service: WorkflowApplicationService = Depends(get_workflow_service)
+):
+    """Record several workflow execution results in one transaction."""
+    try:
+        wf_id = WorkflowId.from_string(workflow_id)
+        workflow = await service.record_workflow_executions(
+            wf_id,
+            [execution.model_dump() for execution in request.executions]
+        )
+        return _workflow_to_response(workflow)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("/{workflow_id}/health", response_model=HealthResponse)
 async def get_workflow_health(
     workflow_id: str,
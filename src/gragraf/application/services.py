@@ -76,6 +76,32 @@ class WorkflowApplicationService:
             await uow.commit()
             return workflow
     
+    async def create_workflows(self, specs: List[Dict[str, Any]]) -> List[Workflow]:
+        """
+        Create several workflows in a single transaction.
+        
+        Args:
+            specs: One dict per workflow with name, dsl and the optional
+                description, tags and created_by fields
+            
+        Returns:
+            Created workflows, in the order given
+            
+        Raises:
+            ValueError: If any DSL fails validation
+            DuplicateWorkflowError: If a name repeats or already exists
+        """
+        for spec in specs:
+            validation_errors = WorkflowValidationService.validate_workflow_dsl(spec["dsl"])
+            if validation_errors:
+                raise ValueError(f"Invalid workflow DSL for '{spec['name']}': {'; '.join(validation_errors)}")
+        
+        async with self._repository_factory.create_unit_of_work() as uow:
+            domain_service = WorkflowDomainService(uow.workflows)
+            workflows = await domain_service.create_workflows(specs)
+            await uow.commit()
+            return workflows
+    
     async def get_workflow(self, workflow_id: WorkflowId) -> Optional[Workflow]:
         """Get a workflow by ID."""
         async with self._repository_factory.create_unit_of_work() as uow:
@@ -312,6 +338,35 @@ class WorkflowApplicationService:
             await uow.commit()
             return updated_workflow
     
+    async def record_workflow_executions(
+        self,
+        workflow_id: WorkflowId,
+        executions: List[Dict[str, Any]]
+    ) -> Workflow:
+        """
+        Record several workflow execution results in a single transaction.
+        
+        Args:
+            workflow_id: The workflow ID
+            executions: Keyword arguments for Workflow.record_execution, applied in order
+            
+        Returns:
+            Updated workflow with execution statistics
+            
+        Raises:
+            ValueError: If workflow not found
+        """
+        async with self._repository_factory.create_unit_of_work() as uow:
+            workflow = await uow.workflows.find_by_id(workflow_id)
+            if not workflow:
+                raise ValueError(f"Workflow {workflow_id} not found")
+            
+            for execution in executions:
+                workflow = workflow.record_execution(**execution)
+            await uow.workflows.save(workflow)
+            await uow.commit()
+            return workflow
+    
     async def get_workflow_health(self, workflow_id: WorkflowId) -> Dict[str, Any]:
         """
         Get health metrics for a workflow.
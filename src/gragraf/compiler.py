@@ -1,8 +1,8 @@
-from typing import Dict, Any, List, Annotated, Optional
+from typing import Dict, Any, List, Annotated, Callable, Optional
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
 from .parser import parse_graph
-from .schemas.graph import NodeType
+from .schemas.graph import Graph, GraphSoA, NodeType
 from .nodes.http_request import HttpRequestNode, HttpRequestConfig
 
 from .nodes.branch import BranchNode, BranchConfig
@@ -14,7 +14,9 @@ from .nodes.end import EndNode
 from .nodes import Conditional
 
 import operator
+from collections import OrderedDict
 import logging
+from functools import cached_property
 
 # Use operator.add to accumulate updates in a list
 def flatten_updates(updates_list: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -28,10 +30,11 @@ def flatten_updates(updates_list: List[Dict[str, Any]]) -> Dict[str, Any]:
     return result
 
 # Custom reducer function for state management
-def state_reducer(x: Dict[str, Any], y: Dict[str, Any]) -> Dict[str, Any]:
+def state_reducer(x: Dict[str, Any], y: Any) -> Dict[str, Any]:
     """
     Advanced state reducer to handle concurrent updates and prevent conflicts.
-    Supports both concurrent update format and direct updates.
+    Supports the concurrent update format, a list or tuple of updates merged
+    in one pass, and direct updates.
     """
     logger = logging.getLogger(__name__)
     
@@ -42,10 +45,11 @@ def state_reducer(x: Dict[str, Any], y: Dict[str, Any]) -> Dict[str, Any]:
     if y is None:
         return result
     
-    # Handle the concurrent update format with __updates__ key
-    if isinstance(y, dict) and "__updates__" in y:
-        logger.info(f"Processing {len(y['__updates__'])} concurrent updates")
-        for update in y["__updates__"]:
+    # Handle the concurrent update format with __updates__ key, or a batch of updates
+    updates = y["__updates__"] if isinstance(y, dict) and "__updates__" in y else y
+    if isinstance(updates, (list, tuple)):
+        logger.info(f"Processing {len(updates)} concurrent updates")
+        for update in updates:
             if isinstance(update, dict):
                 logger.info(f"Applying update: {update}")
                 result.update(update)
@@ -67,11 +71,46 @@ GraphState = Annotated[Dict[str, Any], state_reducer]
 
 global_memory_saver = MemorySaver()
 
+# Node builders keyed by the raw NodeType value, so dispatch is a single str lookup
+_NODE_BUILDERS: Dict[str, Callable[[str, Dict[str, Any]], Any]] = {
+    NodeType.HTTP_REQUEST.value: lambda node_id, config: HttpRequestNode(node_id, HttpRequestConfig.model_validate(config)),
+    NodeType.BRANCH.value: lambda node_id, config: BranchNode(node_id, BranchConfig.model_validate(config)),
+    NodeType.HUMAN_IN_LOOP.value: lambda node_id, config: HumanInLoopNode(node_id, HumanInLoopConfig.model_validate(config)),
+    NodeType.KNOWLEDGE_BASE.value: lambda node_id, config: KnowledgeBaseNode(node_id, KnowledgeBaseConfig.model_validate(config)),
+    NodeType.AGENT.value: lambda node_id, config: AgentNode(node_id, AgentConfig.model_validate(config)),
+    NodeType.START.value: StartNode,
+    NodeType.END.value: EndNode,
+}
+
 class GraphCompiler:
+    # Content hashes of graphs that passed structure validation, least-recently-used
+    # first. Process-global: shared by every compiler instance until cleared.
+    _validated: "OrderedDict[str, None]" = OrderedDict()
+    _validated_size = 256
+
     def __init__(self, graph_dsl: Dict[str, Any], checkpointer: Optional[MemorySaver] = None):
+        self._setup(graph_dsl, parse_graph(graph_dsl), checkpointer)
+
+    @classmethod
+    def from_parsed(
+        cls,
+        graph: Graph,
+        dsl: Optional[Dict[str, Any]] = None,
+        checkpointer: Optional[MemorySaver] = None,
+    ) -> "GraphCompiler":
+        """
+        Build a compiler from an already validated Graph, skipping DSL parsing.
+        When dsl is omitted, graph_dsl is the graph's own dump.
+        """
+        compiler = cls.__new__(cls)
+        compiler._setup(dsl if dsl is not None else graph.model_dump(mode="json"), graph, checkpointer)
+        return compiler
+
+    def _setup(self, graph_dsl: Dict[str, Any], parsed_graph: Graph, checkpointer: Optional[MemorySaver]):
         self.graph_dsl = graph_dsl
-        self.parsed_graph = parse_graph(graph_dsl)
+        self.parsed_graph = parsed_graph
         self.nodes = {node.id: node for node in self.parsed_graph.nodes}
+        self.soa = GraphSoA.from_graph(self.parsed_graph)
         self.node_instances = {}
         self.checkpointer = checkpointer or global_memory_saver
 
@@ -80,55 +119,59 @@ class GraphCompiler:
         node_config = self.nodes[node_id]
         node_type = node_config.type
         
-        if node_type == NodeType.HTTP_REQUEST:
-            config = HttpRequestConfig.model_validate(node_config.config)
-            return HttpRequestNode(node_id, config)
-        elif node_type == NodeType.BRANCH:
-            config = BranchConfig.model_validate(node_config.config)
-            return BranchNode(node_id, config)
-        elif node_type == NodeType.HUMAN_IN_LOOP:
-            config = HumanInLoopConfig.model_validate(node_config.config)
-            return HumanInLoopNode(node_id, config)
-        elif node_type == NodeType.KNOWLEDGE_BASE:
-            config = KnowledgeBaseConfig.model_validate(node_config.config)
-            return KnowledgeBaseNode(node_id, config)
-        elif node_type == NodeType.AGENT:
-            config = AgentConfig.model_validate(node_config.config)
-            return AgentNode(node_id, config)
-        elif node_type == NodeType.START:
-            return StartNode(node_id, node_config.config)
-        elif node_type == NodeType.END:
-            return EndNode(node_id, node_config.config)
-        else:
+        builder = _NODE_BUILDERS.get(node_type.value)
+        if builder is None:
             raise ValueError(f"Unsupported node type: {node_type}")
+        return builder(node_id, node_config.config)
+
+    def _find_single_node(self, node_type: NodeType, label: str) -> str:
+        """Get the ID of the only node of the given type."""
+        matches = [node_id for node_id, type_ in zip(self.soa.node_ids, self.soa.node_types)
+                   if type_ == node_type]
+        if len(matches) != 1:
+            raise ValueError(f"Expected exactly 1 {label} node, found {len(matches)}")
+        return matches[0]
+
+    @cached_property
+    def start_node(self) -> str:
+        """The single start node ID, computed once per compiler."""
+        return self._find_single_node(NodeType.START, "start")
+
+    @cached_property
+    def end_node(self) -> str:
+        """The single end node ID, computed once per compiler."""
+        return self._find_single_node(NodeType.END, "end")
+
+    @cached_property
+    def topological_order(self) -> List[str]:
+        """Node IDs in topological order, computed once per compiler."""
+        return self._compute_topo()
 
     def _get_start_node(self) -> str:
         """Get the single start node ID."""
-        start_nodes = [node_id for node_id, node_config in self.nodes.items() 
-                      if node_config.type == NodeType.START]
-        if len(start_nodes) != 1:
-            raise ValueError(f"Expected exactly 1 start node, found {len(start_nodes)}")
-        return start_nodes[0]
+        return self.start_node
     
     def _get_end_node(self) -> str:
         """Get the single end node ID."""
-        end_nodes = [node_id for node_id, node_config in self.nodes.items() 
-                    if node_config.type == NodeType.END]
-        if len(end_nodes) != 1:
-            raise ValueError(f"Expected exactly 1 end node, found {len(end_nodes)}")
-        return end_nodes[0]
+        return self.end_node
 
     def _topological_sort(self) -> List[str]:
+        """Get the nodes in topological order; raises ValueError on cycles."""
+        return self.topological_order
+
+    def _compute_topo(self) -> List[str]:
         """
         Perform topological sorting using Kahn's algorithm.
         Returns the nodes in topological order.
         Raises ValueError if a cycle is detected.
         """
-        # Calculate in-degree for each node
+        # Calculate in-degree and successors for each node
         in_degree = {node_id: 0 for node_id in self.nodes}
+        successors = {node_id: [] for node_id in self.nodes}
         
-        for edge in self.parsed_graph.edges:
-            in_degree[edge.target] += 1
+        for source, target in zip(self.soa.edge_src, self.soa.edge_dst):
+            in_degree[target] += 1
+            successors[source].append(target)
         
         # Start with nodes that have no incoming edges
         queue = [node_id for node_id, degree in in_degree.items() if degree == 0]
@@ -141,11 +184,10 @@ class GraphCompiler:
             result.append(node)
             
             # Remove this node from the graph and update in-degrees
-            for edge in self.parsed_graph.edges:
-                if edge.source == node:
-                    in_degree[edge.target] -= 1
-                    if in_degree[edge.target] == 0:
-                        queue.append(edge.target)
+            for target in successors[node]:
+                in_degree[target] -= 1
+                if in_degree[target] == 0:
+                    queue.append(target)
         
         # Check for cycles
         if len(result) != len(self.nodes):
@@ -155,14 +197,22 @@ class GraphCompiler:
         return result
 
     def _validate_graph_structure(self):
-        """Validate the graph structure and constraints."""
+        """
+        Validate the graph structure and constraints. Validation only depends on
+        the graph's content, so graphs already validated are skipped by hash.
+        """
+        key = self.parsed_graph.content_hash
+        if key in self._validated:
+            self._validated.move_to_end(key)
+            return
+
         # These methods will raise if not exactly 1 start and 1 end node
         start_node = self._get_start_node()
         end_node = self._get_end_node()
         
         # Check for orphaned nodes (nodes with no incoming or outgoing edges)
-        edge_sources = {edge.source for edge in self.parsed_graph.edges}
-        edge_targets = {edge.target for edge in self.parsed_graph.edges}
+        edge_sources = set(self.soa.edge_src)
+        edge_targets = set(self.soa.edge_dst)
         
         for node_id, node_config in self.nodes.items():
             if node_config.type not in [NodeType.START, NodeType.END]:
@@ -175,6 +225,40 @@ class GraphCompiler:
                 elif not has_outgoing and node_config.type != NodeType.END:
                     raise ValueError(f"Node {node_id} has no outgoing connections")
 
+        self._validated[key] = None
+        if len(self._validated) > self._validated_size:
+            self._validated.popitem(last=False)
+
+    def compile_specialized(self) -> Optional[Callable[[Dict[str, Any]], Dict[str, Any]]]:
+        """
+        Build a straight-line runner for graphs that are a single chain from the
+        start node to the end node without branch or human-in-loop nodes. The runner
+        calls each node's execute in order and merges its update with state_reducer,
+        producing the same final state as invoking the compiled graph.
+        Returns None for any other graph; callers use compile() instead.
+        """
+        self._validate_graph_structure()
+        order = self._topological_sort()
+        is_chain = (
+            order[0] == self.start_node and order[-1] == self.end_node
+            and sorted(zip(self.soa.edge_src, self.soa.edge_dst)) == sorted(zip(order, order[1:]))
+        )
+        if not is_chain or any(type_ in (NodeType.BRANCH, NodeType.HUMAN_IN_LOOP) for type_ in self.soa.node_types):
+            return None
+
+        steps = []
+        for node_id in order:
+            instance = self.node_instances.get(node_id) or self._create_node_instance(node_id)
+            self.node_instances[node_id] = instance
+            steps.append(instance.execute)
+
+        def run(state: Dict[str, Any]) -> Dict[str, Any]:
+            state = state_reducer({}, state)
+            for execute in steps:
+                state = state_reducer(state, execute(state))
+            return state
+        return run
+
     def compile(self):
         """
         Compiles the DSL into an executable LangGraph with proper support for:
@@ -196,14 +280,15 @@ class GraphCompiler:
         
         # Analyze edges to handle multiple input edges properly
         # Group edges by target to detect nodes with multiple inputs
+        node_types = dict(zip(self.soa.node_ids, self.soa.node_types))
         edges_by_target = {}
-        for edge in self.parsed_graph.edges:
-            source_node = self.nodes[edge.source]
-            if source_node.type not in (NodeType.BRANCH, NodeType.HUMAN_IN_LOOP):  # Skip branch and human-in-loop nodes for now
-                target = edge.target
+        outgoing_by_source = {}
+        for source, target, handle in zip(self.soa.edge_src, self.soa.edge_dst, self.soa.edge_handles):
+            outgoing_by_source.setdefault(source, []).append((handle, target))
+            if node_types[source] not in (NodeType.BRANCH, NodeType.HUMAN_IN_LOOP):  # Skip branch and human-in-loop nodes for now
                 if target not in edges_by_target:
                     edges_by_target[target] = []
-                edges_by_target[target].append(edge.source)
+                edges_by_target[target].append(source)
 
         # Add all nodes to the graph
         for node_id, node_config in self.nodes.items():
@@ -239,11 +324,9 @@ class GraphCompiler:
             if node_config.type in [NodeType.BRANCH, NodeType.HUMAN_IN_LOOP]:
                 instance = self.node_instances[node_id]
                 # Find the edges from this conditional node
-                conditional_edges_for_node = [e for e in self.parsed_graph.edges if e.source == node_id]
                 path_map = {}
-                for edge in conditional_edges_for_node:
-                    handle = edge.source_handle or "default"
-                    path_map[handle] = edge.target
+                for handle, target in outgoing_by_source.get(node_id, []):
+                    path_map[handle or "default"] = target
                 # LangGraph requires a mapping function that returns the path key
                 def create_condition_func(inst: Conditional):
                     def condition_func(state):
@@ -261,7 +344,7 @@ class GraphCompiler:
         # Connect the single end node to LangGraph's END
         workflow.add_edge(end_node_id, END)
         # Handle nodes that don't connect to explicit end nodes
-        nodes_with_outgoing = {edge.source for edge in self.parsed_graph.edges}
+        nodes_with_outgoing = set(self.soa.edge_src)
         nodes_with_outgoing.update(node_id for node_id, config in self.nodes.items() 
                                  if config.type in [NodeType.BRANCH, NodeType.HUMAN_IN_LOOP])
         
@@ -38,6 +38,19 @@ class WorkflowRepository(ABC):
         """
         pass
     
+    @abstractmethod
+    async def save_many(self, workflows: List[Workflow]) -> None:
+        """
+        Insert several new workflows in one batch.
+        
+        Args:
+            workflows: The new workflow entities to insert
+            
+        Raises:
+            RepositoryError: If save operation fails
+        """
+        pass
+    
     @abstractmethod
     async def find_by_id(self, workflow_id: WorkflowId) -> Optional[Workflow]:
         """
@@ -70,6 +83,22 @@ class WorkflowRepository(ABC):
         """
         pass
     
+    @abstractmethod
+    async def find_by_names(self, names: List[str]) -> List[Workflow]:
+        """
+        Find the workflows whose names are in the given list.
+        
+        Args:
+            names: The workflow names to look up
+            
+        Returns:
+            The matching workflows (names without a workflow are omitted)
+            
+        Raises:
+            RepositoryError: If query operation fails
+        """
+        pass
+    
     @abstractmethod
     async def find_all(
         self, 
@@ -3,7 +3,7 @@ Domain Services for the Workflow domain.
 Contains business logic that doesn't naturally fit within entities.
 """
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime, timezone
 
 from .entities import Workflow
@@ -58,6 +58,45 @@ class WorkflowDomainService:
         await self._workflow_repository.save(workflow)
         return workflow
     
+    async def create_workflows(self, specs: List[Dict[str, Any]]) -> List[Workflow]:
+        """
+        Create several workflows at once.
+        
+        Args:
+            specs: Keyword arguments for create_workflow, one dict per workflow
+            
+        Returns:
+            New workflow instances, in the order given
+            
+        Raises:
+            DuplicateWorkflowError: If a name repeats in the batch or already exists
+        """
+        names = [spec["name"] for spec in specs]
+        seen = set()
+        for name in names:
+            if name in seen:
+                raise DuplicateWorkflowError(name)
+            seen.add(name)
+        
+        # One lookup for all names instead of one per workflow
+        existing = await self._workflow_repository.find_by_names(names)
+        if existing:
+            raise DuplicateWorkflowError(existing[0].name)
+        
+        workflows = [
+            Workflow.create_new(
+                name=spec["name"],
+                dsl=spec["dsl"],
+                description=spec.get("description"),
+                tags=spec.get("tags") or [],
+                created_by=spec.get("created_by")
+            )
+            for spec in specs
+        ]
+        
+        await self._workflow_repository.save_many(workflows)
+        return workflows
+    
     async def can_delete_workflow(self, workflow_id: WorkflowId) -> bool:
         """
         Check if a workflow can be safely deleted.
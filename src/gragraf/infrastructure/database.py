@@ -2,9 +2,12 @@
 Database configuration and connection management.
 """
 
+import asyncio
+import hashlib
 import os
-from typing import AsyncGenerator
-from sqlalchemy import create_engine
+from typing import AsyncGenerator, Optional
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy.schema import CreateIndex, CreateTable
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 from sqlalchemy.pool import StaticPool
@@ -123,6 +126,58 @@ class DatabaseManager:
         async with self.get_async_engine().begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
     
+    def schema_hash(self) -> str:
+        """Hash of the DDL the current models produce for this engine's dialect."""
+        # Imported here to avoid circular imports; registers the tables on Base.metadata
+        from . import models  # noqa: F401
+        
+        dialect = self.get_async_engine().dialect
+        digest = hashlib.blake2b(digest_size=16)
+        for table in Base.metadata.sorted_tables:
+            digest.update(str(CreateTable(table).compile(dialect=dialect)).encode())
+            for index in sorted(table.indexes, key=lambda index: index.name or ""):
+                digest.update(str(CreateIndex(index).compile(dialect=dialect)).encode())
+        return digest.hexdigest()
+    
+    async def ensure_schema(self) -> bool:
+        """
+        Create tables only when the stored schema hash differs from the current one
+        or a model table is missing. Returns True if DDL was run.
+        """
+        from .models import SchemaVersionModel
+        
+        schema_hash = self.schema_hash()
+        async with self.get_async_engine().begin() as conn:
+            existing_tables = set(await conn.run_sync(
+                lambda sync_conn: inspect(sync_conn).get_table_names()
+            ))
+            if SchemaVersionModel.__tablename__ in existing_tables:
+                stored_hash = (await conn.execute(
+                    select(SchemaVersionModel.schema_hash).where(SchemaVersionModel.id == 1)
+                )).scalar_one_or_none()
+                # A matching hash is not enough if a table was dropped behind our back
+                if stored_hash == schema_hash and all(
+                    table.name in existing_tables for table in Base.metadata.sorted_tables
+                ):
+                    return False
+            
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(SchemaVersionModel.__table__.delete())
+            await conn.execute(SchemaVersionModel.__table__.insert().values(id=1, schema_hash=schema_hash))
+        return True
+    
+    async def ping(self):
+        """Run a trivial query to check out (and open) a pooled connection."""
+        async with self.get_async_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    
+    async def warm_pool(self, size: Optional[int] = None):
+        """Open pooled connections up front so first requests skip the connect cost."""
+        if size is None:
+            # SQLite uses a StaticPool with a single shared connection
+            size = 1 if self.config.is_sqlite else self.config.pool_size
+        await asyncio.gather(*(self.ping() for _ in range(size)))
+    
     async def drop_tables(self):
         """Drop all database tables."""
         async with self.get_async_engine().begin() as conn:
@@ -161,6 +216,11 @@ def initialize_database(config: DatabaseConfig = None) -> DatabaseManager:
     return db_manager
 
 
+def get_database_manager() -> Optional[DatabaseManager]:
+    """Return the global database manager, or None before initialize_database() runs."""
+    return db_manager
+
+
 async def get_database_session() -> AsyncGenerator[AsyncSession, None]:
     """Dependency for getting database sessions."""
     if db_manager is None:
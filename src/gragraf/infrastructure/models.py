@@ -220,4 +220,18 @@ class WorkflowModel(Base):
             definition=definition,
             status=status,
             statistics=statistics
-        ) 
\ No newline at end of file
+        ) 
+
+class SchemaVersionModel(Base):
+    """
+    Single-row record of the schema hash the database was last created with.
+    Lets startup skip DDL when the models have not changed.
+    """
+    __tablename__ = "schema_version"
+    
+    id = Column(Integer, primary_key=True)
+    schema_hash = Column(String(64), nullable=False)
+    updated_at = Column(DateTime, nullable=False, default=utc_now, onupdate=utc_now)
+    
+    def __repr__(self):
+        return f"<SchemaVersionModel(schema_hash='{self.schema_hash}')>"
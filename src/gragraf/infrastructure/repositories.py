@@ -74,6 +74,18 @@ class SQLAlchemyWorkflowRepository(WorkflowRepository):
             await self._session.rollback()
             raise RepositoryError(f"Database error during save: {e}")
     
+    async def save_many(self, workflows: List[Workflow]) -> None:
+        """Insert several new workflows with a single batched flush."""
+        try:
+            self._session.add_all([WorkflowModel.from_domain_entity(workflow) for workflow in workflows])
+            await self._session.flush()
+        except IntegrityError as e:
+            await self._session.rollback()
+            raise RepositoryError(f"Database integrity error: {e}")
+        except SQLAlchemyError as e:
+            await self._session.rollback()
+            raise RepositoryError(f"Database error during bulk save: {e}")
+    
     async def find_by_id(self, workflow_id: WorkflowId) -> Optional[Workflow]:
         """Find a workflow by its ID."""
         try:
@@ -92,6 +104,15 @@ class SQLAlchemyWorkflowRepository(WorkflowRepository):
         except SQLAlchemyError as e:
             raise RepositoryError(f"Database error during find by name: {e}")
     
+    async def find_by_names(self, names: List[str]) -> List[Workflow]:
+        """Find the workflows whose names are in the given list."""
+        try:
+            stmt = select(WorkflowModel).where(WorkflowModel.name.in_(names))
+            result = await self._session.execute(stmt)
+            return [model.to_domain_entity() for model in result.scalars().all()]
+        except SQLAlchemyError as e:
+            raise RepositoryError(f"Database error during find by names: {e}")
+    
     async def find_all(
         self, 
         filter_criteria: Optional[WorkflowFilter] = None,
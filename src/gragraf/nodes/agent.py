@@ -1,16 +1,18 @@
 import os
 from typing import Dict, Any, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from ..utils.templating import render_config
+from ..utils.templating import render_config, find_template_variables
 import logging
 import asyncio
 
 logger = logging.getLogger(__name__)
 
 class AgentConfig(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     model_name: str = "gpt-4o-mini"
     temperature: float = Field(0.7, description="The temperature for the LLM.")
     system_prompt: str = "You are a helpful assistant."
@@ -83,8 +85,6 @@ class AgentNode:
 
     def get_variable_requirements(self) -> Dict[str, Any]:
         """Get information about what variables this agent needs."""
-        from ..utils.templating import find_template_variables
-        
         return {
             "system_prompt_vars": list(find_template_variables(self.config.system_prompt)),
             "user_prompt_vars": list(find_template_variables(self.config.user_prompt)),
@@ -1,5 +1,6 @@
-from typing import Dict, Any, List
-from pydantic import BaseModel, Field
+from types import CodeType
+from typing import Dict, Any, List, Optional, Tuple
+from pydantic import BaseModel, ConfigDict, Field
 from ..utils.templating import render_config
 from . import Conditional
 from logging import getLogger
@@ -7,13 +8,26 @@ from logging import getLogger
 logger = getLogger(__name__)
 
 
+def _compile_condition(condition: str) -> Optional[CodeType]:
+    """Compile a condition expression, or return None if it is not valid Python."""
+    try:
+        return compile(condition, "<branch>", "eval")
+    except SyntaxError as e:
+        logger.warning(f"Invalid branch condition '{condition}': {e}")
+        return None
+
+
 class BranchCondition(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     condition: str = Field(..., description="A Python expression to evaluate for branching.")
     variable: str = Field(default="", description="The variable to evaluate (for UI)")
     operator: str = Field(default="==", description="The operator to use (for UI)")
     value: str = Field(default="", description="The value to compare against (for UI)")
 
 class BranchConfig(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     conditions: List[BranchCondition] = Field(default_factory=list, description="List of conditions to evaluate")
     hasElse: bool = Field(default=False, description="Whether to include an else branch")
 
@@ -21,6 +35,13 @@ class BranchNode(Conditional):
     def __init__(self, id: str, config: BranchConfig):
         self.id = id
         self.config = config
+        # Conditions without template markers are compiled once here; templated
+        # ones (flagged True) are compiled after rendering in execute().
+        self.compiled: List[Tuple[bool, Optional[CodeType]]] = []
+        for condition in config.conditions:
+            templated = '{{' in condition.condition and '}}' in condition.condition
+            code = None if templated else _compile_condition(condition.condition)
+            self.compiled.append((templated, code))
 
     def execute(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """Evaluates conditions and returns the branch decision."""
@@ -30,8 +51,13 @@ class BranchNode(Conditional):
             # Evaluate each condition in order
             for index, condition in enumerate(rendered_config.conditions):
                 try:
+                    templated, code = self.compiled[index]
+                    if templated:
+                        code = _compile_condition(condition.condition)
+                    if code is None:
+                        continue
                     scope = {'state': state}
-                    result = eval(condition.condition, {"__builtins__": {}}, scope)
+                    result = eval(code, {"__builtins__": {}}, scope)
                     if result:
                         decision = f"branch-{index}"
                         break
@@ -51,4 +77,4 @@ class BranchNode(Conditional):
     
     def get_decision(self, state: Dict[str, Any]) -> str:
         """Get the branch decision from state."""
-        return state.get(f"{self.id}_decision")
\ No newline at end of file
+        return state.get(f"{self.id}_decision")
@@ -1,15 +1,19 @@
 from typing import Dict, Any, List
-from pydantic import BaseModel, Field
-from ..utils.templating import render_config
+from pydantic import BaseModel, ConfigDict, Field
+from ..utils.templating import render_config, find_template_variables
 import logging
 
 logger = logging.getLogger(__name__)
 
 class OutputVariable(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     name: str = Field(..., description="Name of the output variable")
     value: str = Field(..., description="Template string for the output value (e.g., '{{variable_name}}')")
 
 class EndConfig(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     outputs: List[OutputVariable] = Field(default_factory=list, description="List of output variables to collect")
 
 class EndNode:
@@ -54,8 +58,6 @@ class EndNode:
 
     def get_requirements(self) -> Dict[str, Any]:
         """Get information about what variables this end node requires."""
-        from ..utils.templating import find_template_variables
-        
         required_vars = set()
         for output_var in self.config.outputs:
             required_vars.update(find_template_variables(output_var.value))
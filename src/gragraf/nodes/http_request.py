@@ -1,13 +1,59 @@
 from typing import Dict, Any, Literal, Optional, Union
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 import httpx
 import time
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+import threading
 import logging
-from ..utils.templating import render_config
+from ..utils.templating import render_config, find_template_variables
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
 
 logger = logging.getLogger(__name__)
 
+class ResponseTooLargeError(ValueError):
+    """Raised when a response body exceeds the configured size limit."""
+    pass
+
+# Pooled clients shared by all nodes, keyed by verify_ssl (the only client-level
+# setting; timeout and redirects are passed per request)
+_SHARED_CLIENTS: Dict[bool, httpx.Client] = {}
+_shared_clients_lock = threading.Lock()
+_SHARED_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=100)
+
+def _new_shared_client(verify_ssl: bool, **kwargs: Any) -> httpx.Client:
+    """
+    Build a pooled client for sharing across workflows. Only connections are
+    pooled: its cookie jar accepts no cookies, so a Set-Cookie from one
+    workflow's response is never sent on another's request.
+    """
+    no_cookies = CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+    return httpx.Client(verify=verify_ssl, limits=_SHARED_LIMITS, cookies=no_cookies, **kwargs)
+
+def _shared_client(verify_ssl: bool) -> httpx.Client:
+    """Return the shared pooled client for a verify_ssl setting, creating it on first use."""
+    client = _SHARED_CLIENTS.get(verify_ssl)
+    if client is None:
+        with _shared_clients_lock:
+            client = _SHARED_CLIENTS.get(verify_ssl)
+            if client is None:
+                client = _new_shared_client(verify_ssl)
+                _SHARED_CLIENTS[verify_ssl] = client
+    return client
+
+def close_shared_clients() -> None:
+    """Close the shared clients; they are recreated on the next request."""
+    with _shared_clients_lock:
+        for client in _SHARED_CLIENTS.values():
+            client.close()
+        _SHARED_CLIENTS.clear()
+
 class HttpRequestConfig(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     method: Literal["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD"] = "GET"
     url: str = Field(..., description="The URL to send the request to.")
     headers: Dict[str, str] = Field(default_factory=dict, description="HTTP headers to include in the request.")
@@ -22,11 +68,15 @@ class HttpRequestConfig(BaseModel):
     output_name: Optional[str] = None
     user_agent: Optional[str] = Field(default=None, description="Custom User-Agent header.")
     extract_text: bool = Field(default=False, description="Extract text content from HTML responses.")
+    max_response_bytes: int = Field(default=10 * 1024 * 1024, description="Maximum response body size in bytes.")
 
 class HttpRequestNode:
-    def __init__(self, node_id: str, config: HttpRequestConfig):
+    def __init__(self, node_id: str, config: HttpRequestConfig, client: Optional[httpx.Client] = None):
         self.node_id = node_id
         self.config = config
+        # An injected client is reused across calls and left open; otherwise
+        # requests go through the shared pooled client for the config's verify_ssl.
+        self.client = client
 
     def _prepare_headers(self, headers: Dict[str, str], user_agent: Optional[str] = None) -> Dict[str, str]:
         prepared_headers = headers.copy()
@@ -43,12 +93,10 @@ class HttpRequestNode:
             return None
         return body
 
-    def _determine_response_format(self, response: httpx.Response, expected_format: str) -> str:
+    def _determine_response_format(self, content_type: str, expected_format: str) -> str:
         if expected_format != "auto":
             return expected_format
         
-        content_type = response.headers.get("content-type", "").lower()
-        
         if "application/json" in content_type:
             return "json"
         elif any(t in content_type for t in ["text/", "application/xml", "application/xhtml"]):
@@ -56,9 +104,34 @@ class HttpRequestNode:
         else:
             return "bytes"
 
+    def _read_limited(self, response: httpx.Response, max_bytes: int) -> httpx.Response:
+        """Buffer a streamed response, aborting as soon as the body exceeds max_bytes."""
+        content_length = response.headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > max_bytes:
+            raise ResponseTooLargeError(f"Response too large: {content_length} bytes exceeds limit of {max_bytes} bytes")
+        
+        chunks = []
+        total = 0
+        for chunk in response.iter_bytes():
+            total += len(chunk)
+            if total > max_bytes:
+                raise ResponseTooLargeError(f"Response too large: exceeds limit of {max_bytes} bytes")
+            chunks.append(chunk)
+        
+        # The body is already decoded, so drop the encoding header before re-wrapping it
+        headers = [(k, v) for k, v in response.headers.multi_items() if k.lower() != "content-encoding"]
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=headers,
+            content=b"".join(chunks),
+            request=response.request,
+        )
+
     def _extract_text_from_html(self, html_content: str) -> str:
+        if BeautifulSoup is None:
+            return html_content
+        
         try:
-            from bs4 import BeautifulSoup
             soup = BeautifulSoup(html_content, 'html.parser')
             
             for script in soup(["script", "style"]):
@@ -82,7 +155,8 @@ class HttpRequestNode:
         }
         
         try:
-            actual_format = self._determine_response_format(response, response_format)
+            content_type = response.headers.get("content-type", "").lower()
+            actual_format = self._determine_response_format(content_type, response_format)
             
             if actual_format == "json":
                 result["body"] = response.json()
@@ -92,7 +166,7 @@ class HttpRequestNode:
                 result["body"] = text_content
                 result["content_type"] = "text"
                 
-                if extract_text and "text/html" in response.headers.get("content-type", "").lower():
+                if extract_text and "text/html" in content_type:
                     result["text_content"] = self._extract_text_from_html(text_content)
             else:
                 result["body"] = response.content
@@ -112,51 +186,45 @@ class HttpRequestNode:
             headers = self._prepare_headers(rendered_config.headers, rendered_config.user_agent)
             body = self._prepare_body(rendered_config.body, rendered_config.method)
             
-            client_config = {
-                "timeout": rendered_config.timeout,
-                "follow_redirects": rendered_config.follow_redirects,
-                "verify": rendered_config.verify_ssl,
-            }
+            client = self.client if self.client is not None else _shared_client(rendered_config.verify_ssl)
             
             last_exception = None
             
             for attempt in range(rendered_config.max_retries + 1):
                 try:
-                    with httpx.Client(**client_config) as client:
-                        if body is not None and isinstance(body, dict):
-                            response = client.request(
-                                method=rendered_config.method,
-                                url=rendered_config.url,
-                                headers=headers,
-                                params=rendered_config.params,
-                                json=body,
-                            )
-                        else:
-                            response = client.request(
-                                method=rendered_config.method,
-                                url=rendered_config.url,
-                                headers=headers,
-                                params=rendered_config.params,
-                                content=body,
-                            )
-                        
-                        response.raise_for_status()
-                        
-                        # Simplified response handling - just return the body content
-                        output_key = self.config.output_name or f"{self.node_id}_output"
-                        
-                        actual_format = self._determine_response_format(response, rendered_config.response_format)
-                        
-                        if actual_format == "json":
-                            return {output_key: response.json()}
-                        elif actual_format == "text":
-                            text_content = response.text
-                            if rendered_config.extract_text and "text/html" in response.headers.get("content-type", "").lower():
-                                text_content = self._extract_text_from_html(text_content)
-                            return {output_key: text_content}
-                        else:
-                            return {output_key: response.content}
-                        
+                    if body is not None and isinstance(body, dict):
+                        body_kwargs = {"json": body}
+                    else:
+                        body_kwargs = {"content": body}
+                    
+                    with client.stream(
+                        method=rendered_config.method,
+                        url=rendered_config.url,
+                        headers=headers,
+                        params=rendered_config.params,
+                        timeout=rendered_config.timeout,
+                        follow_redirects=rendered_config.follow_redirects,
+                        **body_kwargs,
+                    ) as streamed_response:
+                        streamed_response.raise_for_status()
+                        response = self._read_limited(streamed_response, rendered_config.max_response_bytes)
+                    
+                    # Simplified response handling - just return the body content
+                    output_key = self.config.output_name or f"{self.node_id}_output"
+                    
+                    content_type = response.headers.get("content-type", "").lower()
+                    actual_format = self._determine_response_format(content_type, rendered_config.response_format)
+                    
+                    if actual_format == "json":
+                        return {output_key: response.json()}
+                    elif actual_format == "text":
+                        text_content = response.text
+                        if rendered_config.extract_text and "text/html" in content_type:
+                            text_content = self._extract_text_from_html(text_content)
+                        return {output_key: text_content}
+                    else:
+                        return {output_key: response.content}
+                    
                 except (httpx.TimeoutException, httpx.ConnectError, httpx.NetworkError) as e:
                     last_exception = e
                     if attempt < rendered_config.max_retries:
@@ -180,8 +248,6 @@ class HttpRequestNode:
             return {error_key: f"HTTP request failed: {str(e)}"}
 
     def get_requirements(self) -> Dict[str, Any]:
-        from ..utils.templating import find_template_variables
-        
         url_vars = find_template_variables(self.config.url)
         
         header_vars = set()
@@ -1,11 +1,13 @@
 from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from langgraph.types import interrupt, Command
-from ..utils.templating import render_config
+from ..utils.templating import render_config, warm_render_plan
 from . import Conditional
 
 class HumanInLoopConfig(BaseModel):
     """Configuration for Human-in-the-Loop node."""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     message: str = Field(default="Please review and approve or reject.", description="Message to display to the user")
     input_label: str = Field(default="Comments", description="Label for the input field")
     approval_label: str = Field(default="Approve", description="Label for approval button")
@@ -21,6 +23,7 @@ class HumanInLoopNode(Conditional):
     def __init__(self, id: str, config: HumanInLoopConfig):
         self.id = id
         self.config = config
+        warm_render_plan(config)
 
     def execute(self, state: Any) -> Command:
         # 标准 langgraph resume 机制
@@ -1,17 +1,26 @@
 from typing import Dict, Any, List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from langchain_community.vectorstores import FAISS
 from langchain_openai import OpenAIEmbeddings
 from langchain_community.document_loaders import WebBaseLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
 import os
+import hashlib
 import logging
-from ..utils.templating import render_config
+import httpx
+from ..utils.templating import render_config, find_template_variables
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
 
 logger = logging.getLogger(__name__)
 
 class KnowledgeBaseConfig(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     urls: List[str] = Field(default_factory=list, description="List of URLs to load documents from.")
     documents: List[str] = Field(default_factory=list, description="List of document contents.")
     query: str = Field(..., description="Query to search for in the documents.")
@@ -52,9 +61,6 @@ class KnowledgeBaseNode:
                     
                 except Exception:
                     # 备用方法：直接HTTP请求
-                    import httpx
-                    from bs4 import BeautifulSoup
-                    
                     headers = {"User-Agent": "Mozilla/5.0 (compatible; GraGraf/1.0)"}
                     with httpx.Client(timeout=30.0, follow_redirects=True) as client:
                         response = client.get(url, headers=headers)
@@ -62,30 +68,28 @@ class KnowledgeBaseNode:
                         
                         content_type = response.headers.get("content-type", "").lower()
                         
-                        if "text/html" in content_type:
-                            try:
-                                soup = BeautifulSoup(response.text, 'html.parser')
-                                for script in soup(["script", "style"]):
-                                    script.decompose()
-                                
-                                title = soup.find('title')
-                                title_text = title.get_text() if title else ""
-                                text = soup.get_text()
-                                
-                                lines = (line.strip() for line in text.splitlines())
-                                chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                                clean_text = ' '.join(chunk for chunk in chunks if chunk)
-                                
-                                doc = Document(
-                                    page_content=clean_text,
-                                    metadata={"source": url, "title": title_text, "method": "backup"}
-                                )
-                                
-                            except ImportError:
-                                doc = Document(
-                                    page_content=response.text,
-                                    metadata={"source": url, "method": "raw"}
-                                )
+                        if "text/html" in content_type and BeautifulSoup is not None:
+                            soup = BeautifulSoup(response.text, 'html.parser')
+                            for script in soup(["script", "style"]):
+                                script.decompose()
+                            
+                            title = soup.find('title')
+                            title_text = title.get_text() if title else ""
+                            text = soup.get_text()
+                            
+                            lines = (line.strip() for line in text.splitlines())
+                            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+                            clean_text = ' '.join(chunk for chunk in chunks if chunk)
+                            
+                            doc = Document(
+                                page_content=clean_text,
+                                metadata={"source": url, "title": title_text, "method": "backup"}
+                            )
+                        elif "text/html" in content_type:
+                            doc = Document(
+                                page_content=response.text,
+                                metadata={"source": url, "method": "raw"}
+                            )
                         else:
                             doc = Document(
                                 page_content=response.text,
@@ -122,7 +126,25 @@ class KnowledgeBaseNode:
                     split_docs = self.text_splitter.split_documents([doc])
                     all_documents.extend(split_docs)
         
-        return all_documents
+        return self._deduplicate_documents(all_documents)
+
+    def _deduplicate_documents(self, documents: List[Document]) -> List[Document]:
+        """
+        Keep only the first chunk for each distinct content so it is embedded once.
+        Sources of dropped duplicates are recorded on the kept chunk's metadata.
+        """
+        by_hash: Dict[bytes, Document] = {}
+        for doc in documents:
+            content_hash = hashlib.blake2b(doc.page_content.encode(), digest_size=16).digest()
+            kept = by_hash.get(content_hash)
+            if kept is None:
+                by_hash[content_hash] = doc
+            else:
+                kept.metadata.setdefault("duplicate_sources", []).append(doc.metadata.get("source", "unknown"))
+        
+        if len(by_hash) < len(documents):
+            logger.info(f"Deduplicated {len(documents) - len(by_hash)} of {len(documents)} document chunks")
+        return list(by_hash.values())
 
     def execute(self, state: Dict[str, Any]) -> Dict[str, Any]:
         try:
@@ -163,8 +185,6 @@ class KnowledgeBaseNode:
             return {error_key: f"Knowledge base error: {str(e)}"}
 
     def get_requirements(self) -> Dict[str, Any]:
-        from ..utils.templating import find_template_variables
-        
         query_vars = find_template_variables(self.config.query)
         url_vars = set()
         for url in self.config.urls:
@@ -1,14 +1,18 @@
 from typing import Dict, Any, List
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from ..utils.templating import render_config
 import logging
 
 logger = logging.getLogger(__name__)
 
 class InputVariable(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     name: str = Field(..., description="Name of the input variable")
 
 class StartConfig(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     inputs: List[InputVariable] = Field(default_factory=list, description="List of input variables")
 
 class StartNode:
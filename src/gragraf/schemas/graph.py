@@ -1,7 +1,11 @@
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, Any, List, Optional
+from functools import cached_property
+from typing import ClassVar, Dict, Any, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class NodeType(str, Enum):
@@ -22,6 +26,8 @@ class Node(BaseModel):
     """
     Represents a node in the computation graph.
     """
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     id: str = Field(..., description="Unique identifier for the node.")
     type: NodeType = Field(..., description="The type of the node.")
     config: Dict[str, Any] = Field(default_factory=dict, description="Configuration for the node's execution.")
@@ -32,6 +38,8 @@ class Edge(BaseModel):
     """
     Represents a directed edge between two nodes in the graph.
     """
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     id: str = Field(..., description="Unique identifier for the edge.")
     source: str = Field(..., description="The ID of the source node.")
     target: str = Field(..., description="The ID of the target node.")
@@ -43,5 +51,51 @@ class Graph(BaseModel):
     """
     Represents the entire computation graph.
     """
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     nodes: List[Node] = Field(..., description="A list of all nodes in the graph.")
-    edges: List[Edge] = Field(..., description="A list of all edges connecting the nodes.") 
\ No newline at end of file
+    edges: List[Edge] = Field(..., description="A list of all edges connecting the nodes.")
+
+    @cached_property
+    def content_hash(self) -> str:
+        """
+        Stable digest of the graph's serialized content. Cached on first access,
+        so the graph must not be mutated afterwards.
+        """
+        return hashlib.blake2b(self.model_dump_json().encode(), digest_size=16).hexdigest()
+
+
+@dataclass(frozen=True)
+class GraphSoA:
+    """
+    Struct-of-arrays view of a Graph: parallel lists of node and edge attributes
+    for compiler passes that scan every node or edge.
+    """
+    node_ids: List[str]
+    node_types: List[NodeType]
+    node_configs: List[Dict[str, Any]]
+    edge_src: List[str]
+    edge_dst: List[str]
+    edge_handles: List[Optional[str]]
+
+    _cache: ClassVar["OrderedDict[str, GraphSoA]"] = OrderedDict()
+    _cache_size: ClassVar[int] = 128
+
+    @classmethod
+    def from_graph(cls, graph: Graph) -> "GraphSoA":
+        """Build the arrays for a graph, reusing the result for identical content."""
+        key = graph.content_hash
+        soa = cls._cache.get(key)
+        if soa is None:
+            soa = cls(
+                node_ids=[node.id for node in graph.nodes],
+                node_types=[node.type for node in graph.nodes],
+                node_configs=[node.config for node in graph.nodes],
+                edge_src=[edge.source for edge in graph.edges],
+                edge_dst=[edge.target for edge in graph.edges],
+                edge_handles=[edge.source_handle for edge in graph.edges],
+            )
+            cls._cache[key] = soa
+            if len(cls._cache) > cls._cache_size:
+                cls._cache.popitem(last=False)
+        return soa
@@ -1,57 +1,224 @@
 from fastapi import FastAPI
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 from .compiler import GraphCompiler
 from .schemas.graph import Graph
-from .utils.templating import get_debug_info
+from .utils.templating import get_debug_info, warm_render_plan
 from .api.workflows import router as workflows_router
-from .infrastructure.database import initialize_database, DatabaseConfig
+from .infrastructure.database import initialize_database, get_database_manager, DatabaseConfig, DatabaseManager
+from .infrastructure.repositories import RepositoryFactory
+from .application.services import WorkflowApplicationService
+from .nodes.http_request import close_shared_clients
 import logging
-import json
 import asyncio
-from datetime import datetime
-from typing import Dict, Any, AsyncGenerator, Optional
+import orjson
+import hashlib
+from collections import OrderedDict
+from contextlib import aclosing, suppress
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Any, AsyncGenerator, AsyncIterator, List, Optional
+from langgraph.graph.state import CompiledStateGraph
 from langgraph.types import Interrupt, Command
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
-
-# Global database manager
-db_manager = None
+app = FastAPI(default_response_class=ORJSONResponse)
 
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize database on application startup."""
-    global db_manager
     try:
         logger.info("Initializing database...")
         config = DatabaseConfig()
         db_manager = initialize_database(config)
 
-        # Create tables if they don't exist
-        await db_manager.create_tables()
+        # Create tables only when the schema changed, then open pooled connections
+        if await db_manager.ensure_schema():
+            logger.info("Database schema created or updated")
+        await db_manager.warm_pool()
         logger.info("Database initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
         raise
 
+    try:
+        warmed = await _warm_compile_cache(db_manager)
+        logger.info(f"Warmed compile cache with {warmed} active workflows")
+    except Exception as e:
+        # Warming is an optimization; requests compile lazily if it fails
+        logger.warning(f"Failed to warm compile cache: {e}")
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Clean up database connections on application shutdown."""
-    global db_manager
+    """Clean up database and pooled HTTP connections on application shutdown."""
+    db_manager = get_database_manager()
     if db_manager:
         try:
             await db_manager.close()
             logger.info("Database connections closed")
         except Exception as e:
             logger.error(f"Error closing database connections: {e}")
+    close_shared_clients()
 
 app.include_router(workflows_router)
 
+# Compiled graphs keyed by DSL hash, evicted least-recently-used first
+_COMPILE_CACHE: "OrderedDict[str, CompiledStateGraph]" = OrderedDict()
+_COMPILE_CACHE_SIZE = 128
+
+
+def _dsl_hash(dsl_json: str) -> str:
+    """Stable hash of a serialized workflow DSL used as the compile cache key."""
+    return hashlib.blake2b(dsl_json.encode(), digest_size=16).hexdigest()
+
+
+async def _get_compiled_graph(dsl_json: str) -> CompiledStateGraph:
+    """
+    Return the compiled graph for a serialized DSL. The JSON is only parsed
+    and compiled (off the event loop) on a cache miss.
+    """
+    key = _dsl_hash(dsl_json)
+    app_instance = _COMPILE_CACHE.get(key)
+    if app_instance is not None:
+        _COMPILE_CACHE.move_to_end(key)
+        return app_instance
+
+    # Graph construction is CPU-bound; keep it off the event loop
+    app_instance = await asyncio.to_thread(_compile_graph, orjson.loads(dsl_json))
+    _COMPILE_CACHE[key] = app_instance
+    if len(_COMPILE_CACHE) > _COMPILE_CACHE_SIZE:
+        _COMPILE_CACHE.popitem(last=False)
+    return app_instance
+
+
+def _compile_graph(dsl_data: Dict[str, Any]) -> CompiledStateGraph:
+    """Compile a DSL and build the render plans of its node configs."""
+    compiler = GraphCompiler(dsl_data)
+    app_instance = compiler.compile()
+    for instance in compiler.node_instances.values():
+        config = getattr(instance, "config", None)
+        if isinstance(config, BaseModel):
+            warm_render_plan(config)
+    return app_instance
+
+
+_WARM_BUDGET_SECONDS = 5.0
+
+
+async def _warm_compile_cache(db_manager: DatabaseManager, budget: float = _WARM_BUDGET_SECONDS) -> int:
+    """
+    Compile active workflows into the compile cache until the time budget runs out.
+    Workflows that fail to compile are skipped; anything not warmed compiles lazily.
+    """
+    deadline = time.monotonic() + budget
+    service = WorkflowApplicationService(RepositoryFactory(db_manager))
+    warmed = 0
+    for workflow in await service.get_active_workflows():
+        if time.monotonic() >= deadline:
+            logger.info("Compile cache warm-up budget exhausted")
+            break
+        try:
+            dsl_json = Graph.model_validate(workflow.definition.dsl).model_dump_json()
+            await _get_compiled_graph(dsl_json)
+            warmed += 1
+        except Exception as e:
+            logger.debug("Skipping warm-up of workflow %s: %s", workflow.metadata.name, e)
+    return warmed
+
+
+def _sse(payload: Dict[str, Any]) -> bytes:
+    """Encode a payload as a single SSE data frame."""
+    return b"data: " + orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS) + b"\n\n"
+
+
+# Progress chunks are coalesced into one frame per batch window
+_SSE_MAX_BATCH = 32
+_SSE_MAX_WAIT = 0.02
+_STREAM_DONE = object()
+
+
+async def _batch_chunks(
+    chunks: AsyncIterator[Dict[str, Any]],
+    max_batch: int = _SSE_MAX_BATCH,
+    max_wait: float = _SSE_MAX_WAIT,
+) -> AsyncGenerator[List[Dict[str, Any]], None]:
+    """
+    Drain a chunk stream through a queue and yield lists of up to max_batch chunks
+    collected within max_wait seconds. An interrupt chunk closes its batch at once,
+    and a failure in the stream is raised after the chunks before it are yielded.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_batch * 4)
+
+    async def produce() -> None:
+        try:
+            async for chunk in chunks:
+                await queue.put(chunk)
+            await queue.put(_STREAM_DONE)
+        except Exception as e:
+            await queue.put(e)
+
+    loop = asyncio.get_running_loop()
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            batch: List[Dict[str, Any]] = []
+            item = await queue.get()
+            deadline = loop.time() + max_wait
+            while item is not _STREAM_DONE and not isinstance(item, Exception):
+                batch.append(item)
+                if len(batch) >= max_batch or '__interrupt__' in item:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), deadline - loop.time())
+                except asyncio.TimeoutError:
+                    break
+            if batch:
+                yield batch
+            if item is _STREAM_DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+    finally:
+        # Wait for the producer to stop so it no longer reads the stream once we return
+        producer.cancel()
+        with suppress(asyncio.CancelledError):
+            await producer
+
+
+# Comment frames sent while a stream is idle so proxies keep the connection open
+_SSE_PING_INTERVAL = 15.0
+_SSE_PING = b": ping\n\n"
+
+
+async def _with_keepalive(
+    frames: AsyncGenerator[bytes, None],
+    interval: float = _SSE_PING_INTERVAL,
+) -> AsyncGenerator[bytes, None]:
+    """Pass frames through, emitting an SSE comment ping after each idle interval."""
+    pending: Optional[asyncio.Future] = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(frames.__anext__())
+            done, _ = await asyncio.wait({pending}, timeout=interval)
+            if not done:
+                yield _SSE_PING
+                continue
+            next_frame, pending = pending, None
+            try:
+                yield next_frame.result()
+            except StopAsyncIteration:
+                return
+    finally:
+        if pending is not None:
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+        await frames.aclose()
+
 
 class StreamRequest(BaseModel):
     dsl: Graph
@@ -63,60 +230,95 @@ class StreamRequest(BaseModel):
 @app.post("/run/stream")
 async def execute_graph_stream(request: StreamRequest):
     """Execute workflow with streaming updates and human-in-loop support."""
-    async def event_generator() -> AsyncGenerator[str, None]:
+    async def event_generator() -> AsyncGenerator[bytes, None]:
         # Ensure we have a thread_id
         thread_id = request.thread_id or f"thread_{datetime.now().timestamp()}_{id(request)}"
         logger.info(f"Executing workflow with thread_id: {thread_id}")
 
+        # Timestamps are offsets from one wall-clock reading, so they never go
+        # backwards within a stream even if the system clock is adjusted.
+        started_wall = datetime.now()
+        started_mono = time.monotonic()
+
+        def now() -> str:
+            return (started_wall + timedelta(seconds=time.monotonic() - started_mono)).isoformat()
+
+        def frame(event_type: str, timestamp: str, **fields: Any) -> bytes:
+            return _sse({'type': event_type, **fields, 'timestamp': timestamp, 'thread_id': thread_id})
+
+        def progress_frame(timestamp: str, chunks: List[Dict[str, Any]]) -> bytes:
+            # A lone chunk keeps the original 'progress' event so existing clients still see it
+            if len(chunks) == 1:
+                return frame('progress', timestamp, data=chunks[0])
+            return frame('progress_batch', timestamp, chunks=chunks)
+
         try:
             # Send start event
-            yield f"data: {json.dumps({'type': 'start', 'timestamp': datetime.now().isoformat(), 'thread_id': thread_id})}\n\n"
+            yield frame('start', started_wall.isoformat())
 
             # Execute workflow
-            dsl_data = request.dsl.model_dump()
-            compiler = GraphCompiler(dsl_data)
-            app_instance = compiler.compile()
+            # Serialize the DSL once; the same string keys the cache and feeds the compiler
+            app_instance = await _get_compiled_graph(request.dsl.model_dump_json())
             # Configure for streaming with thread support
             config = {"configurable": {"thread_id": thread_id}}
             # Stream execution
             final_state = {}
             interrupt_info = None
             # 处理 human-in-loop resume
-            logger.info(f"request.human_input: {request.human_input}")
+            logger.debug("request.human_input: %s", request.human_input)
             if request.human_input:
                 input_of_graph = Command(resume=list(request.human_input.values())[0])
             else:
                 input_of_graph = request.runtime_inputs or {}
-            logger.info(f"input_of_graph: {input_of_graph}")
-            for chunk in app_instance.stream(input_of_graph, config):
-                final_state.update(chunk)
-                # Check for human-in-loop interrupts
-                interrupt_info: tuple[Interrupt] | None = chunk.get('__interrupt__', None)
-                if interrupt_info is not None:
-                    logger.info(f"yield data: {interrupt_info[0].value}")
-                    yield f"data: {json.dumps({'type': 'human_input_required', 'interrupt_info': interrupt_info[0].value, 'timestamp': datetime.now().isoformat(), 'thread_id': thread_id})}\n\n"
-                    return  # Stop execution, wait for human input
-                else:
-                    logger.info(f"yield data: {chunk}")
-                    yield f"data: {json.dumps({'type': 'progress', 'data': chunk, 'timestamp': datetime.now().isoformat(), 'thread_id': thread_id})}\n\n"
+            logger.debug("input_of_graph: %s", input_of_graph)
+            async with aclosing(_batch_chunks(app_instance.astream(input_of_graph, config))) as batches:
+                async for batch in batches:
+                    timestamp = now()  # One timestamp per batch
+                    progress = []
+                    for chunk in batch:
+                        final_state.update(chunk)
+                        # Check for human-in-loop interrupts
+                        interrupt_info: tuple[Interrupt] | None = chunk.get('__interrupt__', None)
+                        if interrupt_info is not None:
+                            if progress:
+                                yield progress_frame(timestamp, progress)
+                            logger.debug("yield data: %s", interrupt_info[0].value)
+                            yield frame('human_input_required', timestamp, interrupt_info=interrupt_info[0].value)
+                            return  # Stop execution, wait for human input
+                        progress.append(chunk)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("yield data: %s", progress)
+                    yield progress_frame(timestamp, progress)
             # Send completion event
-            logger.info(f"final_state: {final_state}")
-            yield f"data: {json.dumps({'type': 'complete', 'result': final_state, 'timestamp': datetime.now().isoformat(), 'thread_id': thread_id})}\n\n"
+            logger.debug("final_state: %s", final_state)
+            yield frame('complete', now(), result=final_state)
 
         except Exception as e:
             logger.error(f"Streaming execution failed: {e}", exc_info=True)
-            yield f"data: {json.dumps({'type': 'error', 'error': str(e), 'timestamp': datetime.now().isoformat(), 'thread_id': thread_id})}\n\n"
+            yield frame('error', now(), error=str(e))
 
     return StreamingResponse(
-        event_generator(),
-        media_type="text/plain",
+        _with_keepalive(event_generator()),
+        media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
-            "Content-Type": "text/event-stream",
+            "X-Accel-Buffering": "no",
         }
     )
 
 if __name__ == "__main__":
+    import importlib.util
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+
+    # Prefer the uvloop event loop and httptools parser when they are installed
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools" if importlib.util.find_spec("httptools") else "h11",
+        # A single worker: HITL resume relies on the in-process MemorySaver checkpoints
+        workers=1,
+        log_level="warning",
+    )
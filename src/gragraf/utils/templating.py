@@ -1,5 +1,11 @@
-from typing import Any, Dict, List, Set
-from jinja2 import Environment, meta, TemplateError, UndefinedError
+from typing import Annotated, Any, Dict, FrozenSet, List, Literal, Optional, Set, Tuple, Type, get_args, get_origin
+from collections import OrderedDict
+import copy
+from functools import lru_cache, reduce
+from operator import getitem
+import re
+import threading
+from jinja2 import Environment, Template, meta, TemplateError, UndefinedError
 from pydantic import BaseModel
 import logging
 
@@ -9,13 +15,46 @@ env = Environment(undefined=StrictUndefined)
 
 logger = logging.getLogger(__name__)
 
+# Plain `{{ name }}` substitutions are rendered with a regex instead of Jinja.
+_SIMPLE_RE = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+# Names Jinja parses as literals rather than variables
+_JINJA_LITERALS = frozenset({"true", "false", "none", "True", "False", "None"})
+
+@lru_cache(maxsize=4096)
+def _simple_template(template_string: str) -> Optional[Tuple[str, FrozenSet[str]]]:
+    """
+    Return (source, variables) when the template only substitutes plain names,
+    or None when it needs the Jinja pipeline (statements, comments, filters,
+    attribute access, expressions, or newlines Jinja would normalize).
+    """
+    if '{%' in template_string or '{#' in template_string or '\r' in template_string:
+        return None
+    names = _SIMPLE_RE.findall(template_string)
+    if len(names) != template_string.count('{{') or not _JINJA_LITERALS.isdisjoint(names):
+        return None
+    # Jinja drops a single trailing newline from the template source
+    source = template_string[:-1] if template_string.endswith('\n') else template_string
+    return source, frozenset(names)
+
+@lru_cache(maxsize=4096)
+def _compile_template(template_string: str) -> Tuple[Template, FrozenSet[str]]:
+    """
+    Parse and compile a template string once, returning the reusable Template
+    together with its undeclared variables. Cached by the raw template string.
+    """
+    parsed = env.parse(template_string)
+    required_vars = frozenset(meta.find_undeclared_variables(parsed))
+    return env.from_string(parsed), required_vars
+
 def find_template_variables(template_string: str) -> Set[str]:
     """
     Extract all variables referenced in a Jinja2 template string.
     """
+    simple = _simple_template(template_string)
+    if simple is not None:
+        return set(simple[1])
     try:
-        parsed = env.parse(template_string)
-        return meta.find_undeclared_variables(parsed)
+        return set(_compile_template(template_string)[1])
     except Exception as e:
         logger.warning(f"Failed to parse template '{template_string}': {e}")
         return set()
@@ -50,23 +89,28 @@ def render_template_string(template_string: str, state: Dict[str, Any], debug: b
         # State is now directly accessible - no need for flattening
         actual_state = state
         
-        # Find required variables
-        required_vars = find_template_variables(template_string)
-        available_vars = set(actual_state.keys())
-        
-        if debug:
-            validation = validate_template_variables(template_string, available_vars)
+        # Variable validation is only needed for debug output
+        if debug and logger.isEnabledFor(logging.INFO):
+            validation = validate_template_variables(template_string, set(actual_state.keys()))
             logger.info(f"Template validation: {validation}")
         
-        # Create template and render
-        template = env.from_string(template_string)
-        rendered = template.render(actual_state)
+        simple = _simple_template(template_string)
+        if simple is not None:
+            rendered = _SIMPLE_RE.sub(lambda m: str(actual_state[m.group(1)]), simple[0])
+        else:
+            # Reuse the cached compiled template and render
+            template, _ = _compile_template(template_string)
+            rendered = template.render(actual_state)
         
         if debug:
             logger.info(f"Successfully rendered template: '{template_string}' -> '{rendered}'")
         
         return rendered
         
+    except KeyError as e:
+        # Missing name on the simple substitution path, reported like Jinja's UndefinedError
+        logger.error(f"Undefined variable in template '{template_string}': '{e.args[0]}' is undefined")
+        return ""
     except UndefinedError as e:
         logger.error(f"Undefined variable in template '{template_string}': {e}")
         # Return original string with error marker for debugging
@@ -78,45 +122,177 @@ def render_template_string(template_string: str, state: Dict[str, Any], debug: b
         logger.error(f"Unexpected error rendering template '{template_string}': {e}")
         return f"[RENDER_ERROR: {str(e)}] {template_string}"
 
+# A render plan lists the (path, template string, nested_model) entries of a config
+# that contain template markers; nested_model flags paths that pass through a nested
+# BaseModel. The templates differ per instance, so plans are cached per instance, and
+# only for frozen config classes; mutable configs get a fresh plan on every call. The
+# cache key is id(config), but each entry holds the config itself and hits are checked
+# by identity, so a reused id can never serve another object's plan.
+RenderPlan = List[Tuple[Tuple[Any, ...], str, bool]]
+_PLAN_CACHE: "OrderedDict[int, Tuple[BaseModel, RenderPlan]]" = OrderedDict()
+_PLAN_CACHE_SIZE = 1024
+_plan_cache_lock = threading.Lock()
+
+def _is_template(value: str) -> bool:
+    return '{{' in value and '}}' in value
+
+def _format_path(path: Tuple[Any, ...]) -> str:
+    return ".".join(str(part) for part in path)
+
+def _build_render_plan(config: BaseModel) -> RenderPlan:
+    """Collect the paths of all template strings in a config."""
+    plan: RenderPlan = []
+    # Explicit work-list instead of recursion; children are pushed in reverse so
+    # paths come out in field order.
+    stack: List[Tuple[Any, Tuple[Any, ...], bool]] = [(config, (), False)]
+    while stack:
+        obj, path, nested_model = stack.pop()
+        if isinstance(obj, str):
+            if _is_template(obj):
+                plan.append((path, obj, nested_model))
+        elif isinstance(obj, BaseModel):
+            child_nested = nested_model or bool(path)
+            stack.extend(
+                (getattr(obj, name), path + (name,), child_nested)
+                for name in reversed(type(obj).model_fields)
+            )
+        elif isinstance(obj, dict):
+            stack.extend((v, path + (k,), nested_model) for k, v in reversed(obj.items()))
+        elif isinstance(obj, (list, tuple)):
+            stack.extend((obj[i], path + (i,), nested_model) for i in reversed(range(len(obj))))
+    return plan
+
+def get_render_plan(config: BaseModel) -> RenderPlan:
+    """
+    Return the cached render plan for a frozen config instance, building it on first
+    sight. Plans of configs that are not frozen are rebuilt on every call.
+    """
+    if not type(config).model_config.get("frozen"):
+        return _build_render_plan(config)
+
+    key = id(config)
+    with _plan_cache_lock:
+        entry = _PLAN_CACHE.get(key)
+        if entry is not None and entry[0] is config:
+            _PLAN_CACHE.move_to_end(key)
+            return entry[1]
+
+    plan = _build_render_plan(config)
+
+    with _plan_cache_lock:
+        _PLAN_CACHE[key] = (config, plan)
+        _PLAN_CACHE.move_to_end(key)
+        if len(_PLAN_CACHE) > _PLAN_CACHE_SIZE:
+            _PLAN_CACHE.popitem(last=False)
+    return plan
+
+def _annotation_may_hold_str(annotation: Any, seen: FrozenSet[type]) -> bool:
+    """Whether a field annotation admits string values anywhere inside it."""
+    if annotation is Any or annotation is object:
+        return True  # Classes on Python 3.11+, but they admit any value
+    origin = get_origin(annotation)
+    if origin is None:
+        if not isinstance(annotation, type):
+            return True  # Any, TypeVars, forward references: assume it might
+        if issubclass(annotation, str):
+            return True
+        if issubclass(annotation, BaseModel):
+            return annotation not in seen and _model_may_hold_str(annotation, seen | {annotation})
+        return False
+    if origin is Literal:
+        return any(isinstance(arg, str) for arg in get_args(annotation))
+    if origin is Annotated:
+        return _annotation_may_hold_str(get_args(annotation)[0], seen)
+    args = get_args(annotation)
+    return not args or any(_annotation_may_hold_str(arg, seen) for arg in args if arg is not Ellipsis)
+
+def _model_may_hold_str(model_cls: Type[BaseModel], seen: FrozenSet[type]) -> bool:
+    if model_cls.model_config.get("extra") == "allow":
+        return True
+    return any(_annotation_may_hold_str(field.annotation, seen) for field in model_cls.model_fields.values())
+
+@lru_cache(maxsize=None)
+def may_hold_templates(model_cls: Type[BaseModel]) -> bool:
+    """
+    Whether instances of a config class can contain template strings at all.
+    Classes whose fields admit no strings skip rendering entirely.
+    """
+    return _model_may_hold_str(model_cls, frozenset({model_cls}))
+
+def warm_render_plan(config: BaseModel) -> None:
+    """
+    Build and cache the render plan for a config ahead of its first render, and
+    compile the templates it lists so the first execute skips Jinja parsing.
+    """
+    if not may_hold_templates(type(config)):
+        return
+    for _, template_string, _ in get_render_plan(config):
+        if _simple_template(template_string) is None:
+            try:
+                _compile_template(template_string)
+            except TemplateError:
+                pass  # Reported by render_template_string when rendered
+
+def _set_path(container: Any, path: Tuple[Any, ...], value: Any) -> None:
+    reduce(getitem, path[:-1], container)[path[-1]] = value
+
 def render_config(config: BaseModel, state: Dict[str, Any], debug: bool = False) -> BaseModel:
     """
     Renders all string fields in a Pydantic model with the given state.
-    Enhanced with better error handling and debugging capabilities.
+    Only the fields listed in the config's render plan are visited; changed top-level
+    fields are applied with model_copy, and the original config is returned unchanged
+    when nothing was rendered.
     """
-    config_data = config.model_dump()
-    rendered_data = {}
+    if not may_hold_templates(type(config)):
+        return config
+    plan = get_render_plan(config)
     
-    if debug:
+    if debug and logger.isEnabledFor(logging.INFO):
         logger.info(f"Rendering config for {type(config).__name__} with state keys: {list(state.keys())}")
 
-    def render_recursive(obj: Any, path: str = "") -> Any:
-        """Recursively render templates in nested structures"""
-        if isinstance(obj, str):
-            return render_template_string(obj, state, debug)
-        elif isinstance(obj, dict):
-            return {k: render_recursive(v, f"{path}.{k}") for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [render_recursive(item, f"{path}[{i}]") for i, item in enumerate(obj)]
-        else:
-            return obj
-
-    for key, value in config_data.items():
+    changes: List[Tuple[Tuple[Any, ...], str]] = []
+    needs_validation = False
+    for path, template_string, nested_model in plan:
         try:
-            rendered_data[key] = render_recursive(value, key)
-            if debug and isinstance(value, str) and value != rendered_data[key]:
-                logger.info(f"Rendered field '{key}': '{value}' -> '{rendered_data[key]}'")
+            rendered = render_template_string(template_string, state, debug)
         except Exception as e:
-            logger.error(f"Error rendering field '{key}': {e}")
-            rendered_data[key] = value  # Keep original value on error
+            logger.error(f"Error rendering field '{_format_path(path)}': {e}")
+            continue  # Keep original value on error
 
-    # Create a new config instance with the rendered data
-    try:
-        return type(config).model_validate(rendered_data)
-    except Exception as e:
-        logger.error(f"Failed to validate rendered config: {e}")
-        # Return original config if validation fails
+        if rendered == template_string:
+            continue
+        if debug:
+            logger.info(f"Rendered field '{_format_path(path)}': '{template_string}' -> '{rendered}'")
+        changes.append((path, rendered))
+        needs_validation = needs_validation or nested_model
+
+    if not changes:
         return config
 
+    if needs_validation:
+        # Templates inside nested models: rebuild through a full dump/validate
+        rendered_data = config.model_dump()
+        for path, rendered in changes:
+            _set_path(rendered_data, path, rendered)
+        try:
+            return type(config).model_validate(rendered_data)
+        except Exception as e:
+            logger.error(f"Failed to validate rendered config: {e}")
+            # Return original config if validation fails
+            return config
+
+    update: Dict[str, Any] = {}
+    for path, rendered in changes:
+        field = path[0]
+        if len(path) == 1:
+            update[field] = rendered
+            continue
+        if field not in update:
+            # Copy the top-level container once, then patch every rendered leaf in it
+            update[field] = copy.deepcopy(getattr(config, field))
+        _set_path(update[field], path[1:], rendered)
+    return config.model_copy(update=update)
+
 def get_debug_info(config: BaseModel, state: Dict[str, Any]) -> Dict[str, Any]:
     """
     Get debugging information about template rendering for a config.
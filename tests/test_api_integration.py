@@ -4,79 +4,91 @@ API Integration Tests: Test the complete workflows REST API
 """
 
 import pytest
+import copy
 import json
-import asyncio
-from fastapi.testclient import TestClient
-from httpx import AsyncClient
-from pathlib import Path
-import sys
-import tempfile
-import os
-
-# Add source path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import orjson
+from contextlib import contextmanager
+from httpx import ASGITransport, AsyncClient
+import uuid
 
 from gragraf.server import app
-from gragraf.infrastructure.database import DatabaseConfig, DatabaseManager, initialize_database
+from gragraf.infrastructure.database import Base, DatabaseConfig, initialize_database
 from gragraf.infrastructure.repositories import RepositoryFactory
 
 
-@pytest.fixture
-def test_db():
-    """Create a temporary test database"""
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
-        db_path = tmp.name
-    
-    # Create test database config
-    test_db_url = f"sqlite+aiosqlite:///{db_path}"
+@pytest.fixture(scope="session")
+async def test_db():
+    """Create one shared-cache in-memory test database for the session"""
+    test_db_url = f"sqlite+aiosqlite:///file:memdb_{uuid.uuid4().hex}?mode=memory&cache=shared&uri=true"
     config = DatabaseConfig(database_url=test_db_url, echo=False)
     
-    # Initialize database
+    # Initialize database; this manager's open connection keeps the in-memory
+    # database alive until teardown
     db_manager = initialize_database(config)
-    asyncio.run(db_manager.create_tables())
+    await db_manager.create_tables()
     
-    yield db_path
+    yield db_manager
     
     # Cleanup
-    if os.path.exists(db_path):
-        os.unlink(db_path)
+    await db_manager.close()
 
 
-@pytest.fixture
-def client(test_db):
-    """Create test client with test database"""
+async def _truncate_tables(db_manager):
+    """Delete all rows, children first, so each test starts from an empty database"""
+    async with db_manager.get_async_engine().begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            await conn.execute(table.delete())
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _post_json(client, url, obj):
+    """POST a body serialized with orjson instead of httpx's stdlib json encoding"""
+    return client.post(url, content=orjson.dumps(obj), headers=_JSON_HEADERS)
+
+
+def _put_json(client, url, obj):
+    """PUT a body serialized with orjson instead of httpx's stdlib json encoding"""
+    return client.put(url, content=orjson.dumps(obj), headers=_JSON_HEADERS)
+
+
+@contextmanager
+def _override_dependency(dependency, override):
+    """Install a dependency override, restoring the previous overrides on exit"""
+    previous = dict(app.dependency_overrides)
+    app.dependency_overrides[dependency] = override
+    try:
+        yield
+    finally:
+        app.dependency_overrides.clear()
+        app.dependency_overrides.update(previous)
+
+
+@pytest.fixture(scope="session")
+async def http_client(test_db):
+    """Create one in-process async client bound to the test database"""
     from gragraf.api.workflows import get_workflow_service
-    from gragraf.infrastructure.database import DatabaseConfig, initialize_database
     from gragraf.application.services import WorkflowApplicationService
-    from gragraf.infrastructure.repositories import RepositoryFactory
-    
-    # Create test database config and manager
-    test_db_url = f"sqlite+aiosqlite:///{test_db}"
-    config = DatabaseConfig(database_url=test_db_url, echo=False)
-    db_manager = initialize_database(config)
     
     # Override the dependency to use test database
     def get_test_workflow_service() -> WorkflowApplicationService:
-        factory = RepositoryFactory(db_manager)
+        factory = RepositoryFactory(test_db)
         return WorkflowApplicationService(factory)
     
-    app.dependency_overrides[get_workflow_service] = get_test_workflow_service
-    
-    client = TestClient(app)
-    yield client
-    
-    # Cleanup override
-    app.dependency_overrides.clear()
+    with _override_dependency(get_workflow_service, get_test_workflow_service):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            yield client
 
 
 @pytest.fixture
-async def async_client(test_db):
-    """Create async test client"""
-    async with AsyncClient(app=app, base_url="http://test") as client:
-        yield client
+async def client(test_db, http_client):
+    """Shared async client, starting each test from an empty database"""
+    await _truncate_tables(test_db)
+    return http_client
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_workflow_dsl():
     """Sample workflow DSL for testing"""
     return {
@@ -115,10 +127,21 @@ def sample_workflow_dsl():
     }
 
 
+@pytest.fixture
+def make_workflow(client, sample_workflow_dsl):
+    """Factory that creates a workflow from the sample DSL and returns its id"""
+    async def create(name: str, **fields) -> str:
+        response = await _post_json(client, "/workflows/", {"name": name, "dsl": sample_workflow_dsl, **fields})
+        assert response.status_code == 201
+        return response.json()["id"]
+
+    return create
+
+
 class TestWorkflowsCRUD:
     """Test CRUD operations for workflows"""
 
-    def test_create_workflow(self, client, sample_workflow_dsl):
+    async def test_create_workflow(self, client, sample_workflow_dsl):
         """Test creating a new workflow"""
         workflow_data = {
             "name": "Test Workflow",
@@ -128,7 +151,7 @@ class TestWorkflowsCRUD:
             "created_by": "test_user"
         }
         
-        response = client.post("/workflows/", json=workflow_data)
+        response = await _post_json(client, "/workflows/", workflow_data)
         assert response.status_code == 201
         
         data = response.json()
@@ -141,7 +164,7 @@ class TestWorkflowsCRUD:
         assert "id" in data
         assert "created_at" in data
 
-    def test_create_duplicate_workflow(self, client, sample_workflow_dsl):
+    async def test_create_duplicate_workflow(self, client, sample_workflow_dsl):
         """Test creating workflow with duplicate name fails"""
         workflow_data = {
             "name": "Duplicate Test",
@@ -149,68 +172,73 @@ class TestWorkflowsCRUD:
         }
         
         # First creation should succeed
-        response1 = client.post("/workflows/", json=workflow_data)
+        response1 = await _post_json(client, "/workflows/", workflow_data)
         assert response1.status_code == 201
         
         # Second creation should fail
-        response2 = client.post("/workflows/", json=workflow_data)
+        response2 = await _post_json(client, "/workflows/", workflow_data)
         assert response2.status_code == 409
 
-    def test_get_workflow_by_id(self, client, sample_workflow_dsl):
+    async def test_create_workflows_bulk(self, client, make_workflow, sample_workflow_dsl):
+        """Test creating several workflows in one request"""
+        workflows = [
+            {"name": "Bulk Workflow 1", "dsl": sample_workflow_dsl, "tags": ["bulk"]},
+            {"name": "Bulk Workflow 2", "dsl": sample_workflow_dsl},
+        ]
+        response = await _post_json(client, "/workflows/bulk", {"workflows": workflows})
+        assert response.status_code == 201
+        assert [wf["name"] for wf in response.json()] == ["Bulk Workflow 1", "Bulk Workflow 2"]
+        
+        # Names repeated within the batch or already stored are rejected as a whole
+        await make_workflow("Existing Workflow")
+        for names in (["New Workflow", "New Workflow"], ["Another Workflow", "Existing Workflow"]):
+            response = await _post_json(client, "/workflows/bulk", {
+                "workflows": [{"name": name, "dsl": sample_workflow_dsl} for name in names]
+            })
+            assert response.status_code == 409
+        
+        response = await client.get("/workflows/")
+        assert response.json()["total"] == 3
+
+    async def test_get_workflow_by_id(self, client, make_workflow):
         """Test retrieving workflow by ID"""
-        # Create workflow first
-        workflow_data = {
-            "name": "Get Test Workflow",
-            "dsl": sample_workflow_dsl
-        }
-        create_response = client.post("/workflows/", json=workflow_data)
-        workflow_id = create_response.json()["id"]
+        workflow_id = await make_workflow("Get Test Workflow")
         
         # Get workflow
-        response = client.get(f"/workflows/{workflow_id}")
+        response = await client.get(f"/workflows/{workflow_id}")
         assert response.status_code == 200
         
         data = response.json()
         assert data["id"] == workflow_id
         assert data["name"] == "Get Test Workflow"
 
-    def test_get_workflow_by_name(self, client, sample_workflow_dsl):
+    async def test_get_workflow_by_name(self, client, make_workflow):
         """Test retrieving workflow by name"""
-        # Create workflow first
-        workflow_data = {
-            "name": "Name Test Workflow",
-            "dsl": sample_workflow_dsl
-        }
-        client.post("/workflows/", json=workflow_data)
+        await make_workflow("Name Test Workflow")
         
         # Get workflow by name
-        response = client.get("/workflows/name/Name Test Workflow")
+        response = await client.get("/workflows/name/Name Test Workflow")
         assert response.status_code == 200
         
         data = response.json()
         assert data["name"] == "Name Test Workflow"
 
-    def test_get_nonexistent_workflow(self, client):
+    async def test_get_nonexistent_workflow(self, client):
         """Test getting non-existent workflow returns 404"""
-        response = client.get("/workflows/nonexistent-id")
+        response = await client.get("/workflows/nonexistent-id")
         assert response.status_code == 400  # Invalid UUID format
         
-        response = client.get("/workflows/00000000-0000-0000-0000-000000000000")
+        response = await client.get("/workflows/00000000-0000-0000-0000-000000000000")
         assert response.status_code == 404
 
-    def test_list_workflows(self, client, sample_workflow_dsl):
+    async def test_list_workflows(self, client, make_workflow):
         """Test listing workflows"""
         # Create multiple workflows
         for i in range(3):
-            workflow_data = {
-                "name": f"List Test Workflow {i}",
-                "dsl": sample_workflow_dsl,
-                "tags": ["test"] if i % 2 == 0 else ["demo"]
-            }
-            client.post("/workflows/", json=workflow_data)
+            await make_workflow(f"List Test Workflow {i}", tags=["test"] if i % 2 == 0 else ["demo"])
         
         # List all workflows
-        response = client.get("/workflows/")
+        response = await client.get("/workflows/")
         assert response.status_code == 200
         
         data = response.json()
@@ -218,61 +246,41 @@ class TestWorkflowsCRUD:
         assert "total" in data
         assert data["total"] >= 3
 
-    def test_list_workflows_with_filters(self, client, sample_workflow_dsl):
+    async def test_list_workflows_with_filters(self, client, make_workflow):
         """Test listing workflows with filters"""
         # Create workflows with different tags
-        client.post("/workflows/", json={
-            "name": "Filter Test 1",
-            "dsl": sample_workflow_dsl,
-            "tags": ["production"]
-        })
-        client.post("/workflows/", json={
-            "name": "Filter Test 2", 
-            "dsl": sample_workflow_dsl,
-            "tags": ["development"]
-        })
+        await make_workflow("Filter Test 1", tags=["production"])
+        await make_workflow("Filter Test 2", tags=["development"])
         
-        # Filter by tags
-        response = client.get("/workflows/?tags=production")
+        # Filter by tags, with a bounded page
+        response = await client.get("/workflows/?tags=production&limit=10")
         assert response.status_code == 200
         
         data = response.json()
+        assert data["total"] == 1
         assert all("production" in wf["tags"] for wf in data["workflows"])
 
-    def test_update_workflow_definition(self, client, sample_workflow_dsl):
+    async def test_update_workflow_definition(self, client, make_workflow, sample_workflow_dsl):
         """Test updating workflow definition"""
-        # Create workflow
-        workflow_data = {
-            "name": "Update Test Workflow",
-            "dsl": sample_workflow_dsl
-        }
-        create_response = client.post("/workflows/", json=workflow_data)
-        workflow_id = create_response.json()["id"]
+        workflow_id = await make_workflow("Update Test Workflow")
         
         # Update definition
-        updated_dsl = {**sample_workflow_dsl}
+        updated_dsl = copy.deepcopy(sample_workflow_dsl)
         updated_dsl["nodes"][1]["config"]["systemPrompt"] = "Updated prompt"
         
-        response = client.put(f"/workflows/{workflow_id}/definition", 
-                            json={"dsl": updated_dsl})
+        response = await _put_json(client, f"/workflows/{workflow_id}/definition", {"dsl": updated_dsl})
         assert response.status_code == 200
         
         data = response.json()
         assert data["version"] == 2
         assert data["definition"]["nodes"][1]["config"]["systemPrompt"] == "Updated prompt"
 
-    def test_update_workflow_metadata(self, client, sample_workflow_dsl):
+    async def test_update_workflow_metadata(self, client, make_workflow):
         """Test updating workflow metadata"""
-        # Create workflow
-        workflow_data = {
-            "name": "Metadata Test Workflow",
-            "dsl": sample_workflow_dsl
-        }
-        create_response = client.post("/workflows/", json=workflow_data)
-        workflow_id = create_response.json()["id"]
+        workflow_id = await make_workflow("Metadata Test Workflow")
         
         # Update metadata
-        response = client.put(f"/workflows/{workflow_id}/metadata", json={
+        response = await _put_json(client, f"/workflows/{workflow_id}/metadata", {
             "name": "Updated Metadata Test",
             "description": "Updated description",
             "tags": ["updated", "metadata"]
@@ -288,82 +296,36 @@ class TestWorkflowsCRUD:
 class TestWorkflowStatusManagement:
     """Test workflow status management"""
 
-    def test_activate_workflow(self, client, sample_workflow_dsl):
-        """Test activating a workflow"""
-        # Create workflow
-        workflow_data = {
-            "name": "Activate Test Workflow",
-            "dsl": sample_workflow_dsl
-        }
-        create_response = client.post("/workflows/", json=workflow_data)
-        workflow_id = create_response.json()["id"]
-        
-        # Activate workflow
-        response = client.post(f"/workflows/{workflow_id}/activate")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["status"] == "active"
-
-    def test_deactivate_workflow(self, client, sample_workflow_dsl):
-        """Test deactivating a workflow"""
-        # Create and activate workflow
-        workflow_data = {
-            "name": "Deactivate Test Workflow",
-            "dsl": sample_workflow_dsl
-        }
-        create_response = client.post("/workflows/", json=workflow_data)
-        workflow_id = create_response.json()["id"]
-        
-        client.post(f"/workflows/{workflow_id}/activate")
-        
-        # Deactivate workflow
-        response = client.post(f"/workflows/{workflow_id}/deactivate")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["status"] == "inactive"
-
-    def test_archive_workflow(self, client, sample_workflow_dsl):
-        """Test archiving a workflow"""
-        # Create workflow
-        workflow_data = {
-            "name": "Archive Test Workflow",
-            "dsl": sample_workflow_dsl
-        }
-        create_response = client.post("/workflows/", json=workflow_data)
-        workflow_id = create_response.json()["id"]
+    @pytest.mark.parametrize("actions,expected", [
+        (["activate"], "active"),
+        (["activate", "deactivate"], "inactive"),
+        (["archive"], "archived"),
+    ])
+    async def test_status_transition(self, client, make_workflow, actions, expected):
+        """Test activating, deactivating and archiving a workflow"""
+        workflow_id = await make_workflow("Status Test Workflow")
         
-        # Archive workflow
-        response = client.post(f"/workflows/{workflow_id}/archive")
-        assert response.status_code == 200
+        for action in actions:
+            response = await client.post(f"/workflows/{workflow_id}/{action}")
+            assert response.status_code == 200
         
         data = response.json()
-        assert data["status"] == "archived"
+        assert data["status"] == expected
 
-    def test_get_active_workflows(self, client, sample_workflow_dsl):
+    async def test_get_active_workflows(self, client, make_workflow):
         """Test getting only active workflows"""
         # Create and activate multiple workflows
         active_workflows = []
         for i in range(2):
-            workflow_data = {
-                "name": f"Active Workflow {i}",
-                "dsl": sample_workflow_dsl
-            }
-            create_response = client.post("/workflows/", json=workflow_data)
-            workflow_id = create_response.json()["id"]
-            client.post(f"/workflows/{workflow_id}/activate")
+            workflow_id = await make_workflow(f"Active Workflow {i}")
+            await client.post(f"/workflows/{workflow_id}/activate")
             active_workflows.append(workflow_id)
         
         # Create inactive workflow
-        inactive_data = {
-            "name": "Inactive Workflow",
-            "dsl": sample_workflow_dsl
-        }
-        client.post("/workflows/", json=inactive_data)
+        await make_workflow("Inactive Workflow")
         
         # Get active workflows
-        response = client.get("/workflows/active/list")
+        response = await client.get("/workflows/active/list")
         assert response.status_code == 200
         
         data = response.json()
@@ -374,50 +336,38 @@ class TestWorkflowStatusManagement:
 class TestWorkflowExecution:
     """Test workflow execution tracking"""
 
-    def test_record_execution(self, client, sample_workflow_dsl):
+    async def test_record_execution(self, client, make_workflow):
         """Test recording workflow execution"""
-        # Create workflow
-        workflow_data = {
-            "name": "Execution Test Workflow",
-            "dsl": sample_workflow_dsl
-        }
-        create_response = client.post("/workflows/", json=workflow_data)
-        workflow_id = create_response.json()["id"]
+        workflow_id = await make_workflow("Execution Test Workflow")
         
         # Record execution
         execution_data = {
             "success": True,
             "execution_time_ms": 1500.0
         }
-        response = client.post(f"/workflows/{workflow_id}/executions", 
-                             json=execution_data)
+        response = await _post_json(client, f"/workflows/{workflow_id}/executions", execution_data)
         assert response.status_code == 200
         
         data = response.json()
         assert data["statistics"]["total_executions"] == 1
         assert data["statistics"]["successful_executions"] == 1
 
-    def test_get_workflow_health(self, client, sample_workflow_dsl):
+    async def test_get_workflow_health(self, client, make_workflow):
         """Test getting workflow health metrics"""
-        # Create workflow
-        workflow_data = {
-            "name": "Health Test Workflow",
-            "dsl": sample_workflow_dsl
-        }
-        create_response = client.post("/workflows/", json=workflow_data)
-        workflow_id = create_response.json()["id"]
-        
-        # Record some executions
-        for success in [True, True, False]:
-            execution_data = {
-                "success": success,
-                "execution_time_ms": 1000.0
-            }
-            client.post(f"/workflows/{workflow_id}/executions", 
-                       json=execution_data)
+        workflow_id = await make_workflow("Health Test Workflow")
+        
+        # Record some executions in one request and one transaction
+        executions = [
+            {"success": success, "execution_time_ms": 1000.0}
+            for success in [True, True, False]
+        ]
+        response = await _post_json(client, f"/workflows/{workflow_id}/executions/bulk",
+                                    {"executions": executions})
+        assert response.status_code == 200
+        assert response.json()["statistics"]["total_executions"] == 3
         
         # Get health
-        response = client.get(f"/workflows/{workflow_id}/health")
+        response = await client.get(f"/workflows/{workflow_id}/health")
         assert response.status_code == 200
         
         data = response.json()
@@ -429,27 +379,18 @@ class TestWorkflowExecution:
 class TestWorkflowSimilarity:
     """Test workflow similarity features"""
 
-    def test_find_similar_workflows(self, client, sample_workflow_dsl):
+    async def test_find_similar_workflows(self, client, sample_workflow_dsl):
         """Test finding similar workflows"""
-        # Create base workflow
-        workflow_data = {
-            "name": "Base Workflow",
-            "dsl": sample_workflow_dsl,
-            "tags": ["ai", "agent"]
-        }
-        create_response = client.post("/workflows/", json=workflow_data)
-        base_id = create_response.json()["id"]
-        
-        # Create similar workflow
-        similar_data = {
-            "name": "Similar Workflow",
-            "dsl": sample_workflow_dsl,
-            "tags": ["ai", "chatbot"]
-        }
-        client.post("/workflows/", json=similar_data)
+        # Create base and similar workflows in one request
+        response = await _post_json(client, "/workflows/bulk", {"workflows": [
+            {"name": "Base Workflow", "dsl": sample_workflow_dsl, "tags": ["ai", "agent"]},
+            {"name": "Similar Workflow", "dsl": sample_workflow_dsl, "tags": ["ai", "chatbot"]},
+        ]})
+        assert response.status_code == 201
+        base_id = response.json()[0]["id"]
         
         # Find similar workflows
-        response = client.get(f"/workflows/{base_id}/similar?threshold=0.5")
+        response = await client.get(f"/workflows/{base_id}/similar?threshold=0.5")
         assert response.status_code == 200
         
         # Should return some results (exact similarity algorithm depends on implementation)
@@ -460,33 +401,32 @@ class TestWorkflowSimilarity:
 class TestErrorHandling:
     """Test API error handling"""
 
-    def test_invalid_workflow_data(self, client):
+    async def test_invalid_workflow_data(self, client):
         """Test creating workflow with invalid data"""
         invalid_data = {
             "name": "",  # Empty name
             "dsl": {}    # Empty DSL
         }
-        response = client.post("/workflows/", json=invalid_data)
+        response = await _post_json(client, "/workflows/", invalid_data)
         assert response.status_code == 400
 
-    def test_invalid_workflow_id_format(self, client):
+    async def test_invalid_workflow_id_format(self, client):
         """Test operations with invalid workflow ID format"""
-        response = client.get("/workflows/invalid-id")
+        response = await client.get("/workflows/invalid-id")
         assert response.status_code == 400
 
-    def test_workflow_not_found_operations(self, client):
+    async def test_workflow_not_found_operations(self, client):
         """Test operations on non-existent workflows"""
         fake_id = "00000000-0000-0000-0000-000000000000"
         
         # Various operations should return 404
-        response = client.get(f"/workflows/{fake_id}")
+        response = await client.get(f"/workflows/{fake_id}")
         assert response.status_code == 404
         
-        response = client.put(f"/workflows/{fake_id}/definition", 
-                            json={"dsl": {}})
+        response = await _put_json(client, f"/workflows/{fake_id}/definition", {"dsl": {}})
         assert response.status_code == 400  # Will fail validation first
         
-        response = client.post(f"/workflows/{fake_id}/activate")
+        response = await client.post(f"/workflows/{fake_id}/activate")
         assert response.status_code == 400  # Will fail validation first
 
 
@@ -1,4 +1,6 @@
 import pytest
+from unittest.mock import patch
+from gragraf.utils import templating
 from gragraf.nodes.branch import BranchNode, BranchConfig, BranchCondition
 
 def test_branch_node_true_condition():
@@ -61,4 +63,34 @@ def test_branch_node_syntax_error():
     input_state = {"x": 10}
     
     result = node.execute(input_state)
-    assert result == {"branch_node_4_decision": "error_path"} 
\ No newline at end of file
+    assert result == {"branch_node_4_decision": "error_path"} 
+
+def test_branch_node_precompiles_conditions():
+    """
+    Tests that template-free conditions are compiled once at construction and that
+    invalid syntax is recorded as None instead of raising.
+    """
+    conditions = [
+        BranchCondition(condition="state['x'] > 5"),
+        BranchCondition(condition="state['x' > 5"),
+        BranchCondition(condition="state['x'] > {{ limit }}"),
+    ]
+    node = BranchNode("branch_node_5", BranchConfig(conditions=conditions))
+
+    assert node.compiled[0][0] is False and node.compiled[0][1] is not None
+    assert node.compiled[1] == (False, None)
+    assert node.compiled[2] == (True, None)
+    assert node.execute({"x": 3, "limit": 1}) == {"branch_node_5_decision": "branch-2"}
+
+def test_branch_node_reuses_render_plan():
+    """
+    Tests that a branch node's frozen config builds its render plan once across executions.
+    """
+    conditions = [BranchCondition(condition="state['x'] > {{ limit }}")]
+    node = BranchNode("branch_node_6", BranchConfig(conditions=conditions))
+
+    with patch.object(templating, "_build_render_plan", wraps=templating._build_render_plan) as build_plan:
+        assert node.execute({"x": 3, "limit": 1}) == {"branch_node_6_decision": "branch-0"}
+        assert node.execute({"x": 3, "limit": 2}) == {"branch_node_6_decision": "branch-0"}
+
+    assert build_plan.call_count == 1
@@ -73,7 +73,7 @@ def test_parse_graph_with_invalid_node_type():
 class TestGraphParserAdvanced:
     """图解析器高级单元测试"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def simple_graph_dsl(self):
         """简单图DSL"""
         return {
@@ -88,9 +88,14 @@ class TestGraphParserAdvanced:
             ]
         }
     
-    def test_parse_nodes_detailed(self, simple_graph_dsl):
+    @pytest.fixture(scope="session")
+    def parsed_simple(self, simple_graph_dsl):
+        """解析后的简单图（Graph 模型不可变，可在测试间共享）"""
+        return parse_graph(simple_graph_dsl)
+    
+    def test_parse_nodes_detailed(self, parsed_simple):
         """测试节点解析详细逻辑"""
-        parsed = parse_graph(simple_graph_dsl)
+        parsed = parsed_simple
         
         assert len(parsed.nodes) == 3
         node_ids = [node.id for node in parsed.nodes]
@@ -104,9 +109,9 @@ class TestGraphParserAdvanced:
         assert node_by_id["agent_1"].type == NodeType.AGENT
         assert node_by_id["end_1"].type == NodeType.END
     
-    def test_parse_edges_detailed(self, simple_graph_dsl):
+    def test_parse_edges_detailed(self, parsed_simple):
         """测试边解析详细逻辑"""
-        parsed = parse_graph(simple_graph_dsl)
+        parsed = parsed_simple
         
         assert len(parsed.edges) == 2
         edge_pairs = [(edge.source, edge.target) for edge in parsed.edges]
@@ -1,49 +1,77 @@
 import pytest
-import json
+import orjson
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 from gragraf.compiler import GraphCompiler, state_reducer
-from gragraf.schemas.graph import Graph, Node, Edge, NodeType
+from gragraf.nodes.branch import BranchNode
+from gragraf.nodes.http_request import HttpRequestNode
+from gragraf.schemas.graph import Graph, GraphSoA, Node, Edge, NodeType
+
+SAMPLE_GRAPH_DSL = {
+    "nodes": [
+        {"id": "start", "type": "start", "config": {}},
+        {"id": "http", "type": "http_request", "config": {"url": "http://test.com"}},
+        {"id": "end", "type": "end", "config": {}},
+    ],
+    "edges": [
+        {"id": "e1", "source": "start", "target": "http"},
+        {"id": "e2", "source": "http", "target": "end"},
+    ],
+}
+
+# Validated once; tests that don't exercise parsing build compilers from it directly
+SAMPLE_GRAPH = Graph.model_validate(SAMPLE_GRAPH_DSL)
+
+class _ExecuteStub:
+    """
+    Stand-in for a node's execute method: returns a fixed update and records
+    the positional arguments of each call. Set on the class, it is not bound,
+    so the recorded arguments are exactly what the graph passed.
+    """
+    def __init__(self, return_value):
+        self.return_value = return_value
+        self.calls = []
+
+    def __call__(self, *args):
+        self.calls.append(args)
+        return self.return_value
+
+def called_with_arg(stub, arg0):
+    """Whether any recorded call of the stub received arg0 as its first positional argument."""
+    return any(args and args[0] == arg0 for args in stub.calls)
+
+@pytest.fixture(autouse=True)
+def _clear_validation_cache():
+    """Start each test with an empty process-global validation cache, so validation really runs."""
+    GraphCompiler._validated.clear()
 
 @pytest.fixture
 def sample_graph_dsl():
     """Provides a simple graph DSL for testing."""
-    return {
-        "nodes": [
-            {"id": "start", "type": "start", "config": {}},
-            {"id": "http", "type": "http_request", "config": {"url": "http://test.com"}},
-            {"id": "end", "type": "end", "config": {}},
-        ],
-        "edges": [
-            {"id": "e1", "source": "start", "target": "http"},
-            {"id": "e2", "source": "http", "target": "end"},
-        ],
-    }
+    return SAMPLE_GRAPH_DSL
 
-@patch('gragraf.nodes.http_request.HttpRequestNode.execute')
-def test_compiled_graph_execution(mock_http_execute, sample_graph_dsl):
+def test_compiled_graph_execution(monkeypatch):
     """
     Tests that a compiled graph can be executed and that the mock node is called.
     """
-    # Mock the http node to return a predictable state change
-    mock_http_execute.return_value = {"http_output": "mocked_response"}
+    # Stub the http node to return a predictable state change
+    http_execute = _ExecuteStub({"http_output": "mocked_response"})
+    monkeypatch.setattr(HttpRequestNode, "execute", http_execute)
 
-    compiler = GraphCompiler(sample_graph_dsl)
+    compiler = GraphCompiler.from_parsed(SAMPLE_GRAPH)
     app = compiler.compile()
 
     # Execute the graph
     final_state = app.invoke({})
 
     # Verify that the http node's execute method was called
-    mock_http_execute.assert_called_once()
+    assert len(http_execute.calls) == 1
     
     # Verify the final state - now includes end node outputs
     assert "http_output" in final_state
     assert final_state["http_output"] == "mocked_response"
 
-@patch('gragraf.nodes.branch.BranchNode.execute')
-@patch('gragraf.nodes.http_request.HttpRequestNode.execute')
-def test_conditional_graph_execution(mock_http_execute, mock_branch_execute):
+def test_conditional_graph_execution(monkeypatch):
     """
     Tests that a graph with a branch node executes the correct path.
     """
@@ -81,9 +109,11 @@ def test_conditional_graph_execution(mock_http_execute, mock_branch_execute):
         ],
     }
 
-    # Mock branch to return decision in new format
-    mock_branch_execute.return_value = {"branch_decision": "branch-0"}
-    mock_http_execute.return_value = {"http_output": "true_path_response"}
+    # Stub branch to return decision in new format
+    branch_execute = _ExecuteStub({"branch_decision": "branch-0"})
+    http_execute = _ExecuteStub({"http_output": "true_path_response"})
+    monkeypatch.setattr(BranchNode, "execute", branch_execute)
+    monkeypatch.setattr(HttpRequestNode, "execute", http_execute)
 
     compiler = GraphCompiler(branching_dsl)
     app = compiler.compile()
@@ -91,13 +121,136 @@ def test_conditional_graph_execution(mock_http_execute, mock_branch_execute):
     final_state = app.invoke({"x": 10}, config={"configurable": {"thread_id": "test_conditional"}})
 
     # Verify that the branch node was called
-    mock_branch_execute.assert_any_call({"x": 10})
+    assert called_with_arg(branch_execute, {"x": 10})
     # Verify that the correct http node was called
-    mock_http_execute.assert_called_once()
+    assert len(http_execute.calls) == 1
     # Check the final state
     assert final_state["http_output"] == "true_path_response"
 
 
+def test_graph_content_hash_and_soa(sample_graph_dsl):
+    """
+    Tests that equal graphs share a content hash and struct-of-arrays view.
+    """
+    graph = Graph.model_validate(sample_graph_dsl)
+    same = Graph.model_validate(sample_graph_dsl)
+
+    assert graph.content_hash == same.content_hash
+    assert "content_hash" not in graph.model_dump()
+
+    soa = GraphSoA.from_graph(graph)
+    assert GraphSoA.from_graph(same) is soa
+    assert soa.node_ids == ["start", "http", "end"]
+    assert soa.node_types == [NodeType.START, NodeType.HTTP_REQUEST, NodeType.END]
+    assert list(zip(soa.edge_src, soa.edge_dst)) == [("start", "http"), ("http", "end")]
+
+
+def test_graph_models_are_frozen(sample_graph_dsl):
+    """
+    Tests that parsed graphs cannot be reassigned after their hash is cached.
+    """
+    from pydantic import ValidationError
+
+    graph = Graph.model_validate(sample_graph_dsl)
+
+    with pytest.raises(ValidationError):
+        graph.nodes[0].type = NodeType.END
+    with pytest.raises(ValidationError):
+        graph.edges = []
+
+def test_topo_sort_computed_once():
+    """
+    Tests that the topological order and start/end lookups are computed once per compiler.
+    """
+    compiler = GraphCompiler.from_parsed(SAMPLE_GRAPH)
+
+    with patch.object(compiler, '_compute_topo', wraps=compiler._compute_topo) as compute_topo:
+        assert compiler.topological_order == ["start", "http", "end"]
+        assert compiler._topological_sort() is compiler.topological_order
+
+    assert compute_topo.call_count == 1
+    assert compiler._get_start_node() == compiler.start_node == "start"
+    assert compiler._get_end_node() == compiler.end_node == "end"
+
+def test_validate_cached():
+    """
+    Tests that a graph whose content was already validated skips the structure checks.
+    """
+    GraphCompiler.from_parsed(SAMPLE_GRAPH)._validate_graph_structure()
+    compiler = GraphCompiler.from_parsed(SAMPLE_GRAPH)
+
+    with patch.object(compiler, '_get_start_node', wraps=compiler._get_start_node) as get_start:
+        compiler._validate_graph_structure()
+
+    get_start.assert_not_called()
+
+def test_from_parsed_matches_dsl_constructor(sample_graph_dsl):
+    """
+    Tests that a compiler built from a parsed graph matches one built from the DSL.
+    """
+    from_dsl = GraphCompiler(sample_graph_dsl)
+    from_graph = GraphCompiler.from_parsed(SAMPLE_GRAPH, dsl=sample_graph_dsl)
+
+    assert from_graph.parsed_graph is SAMPLE_GRAPH
+    assert from_graph.graph_dsl is sample_graph_dsl
+    assert from_graph.nodes == from_dsl.nodes
+    assert from_graph.topological_order == from_dsl.topological_order
+
+# start -> http_a -> http_b -> end, with declared inputs and rendered outputs
+LONG_CHAIN_GRAPH = Graph.model_validate({
+    "nodes": [
+        {"id": "start", "type": "start", "config": {"inputs": [{"name": "x"}]}},
+        {"id": "http_a", "type": "http_request", "config": {"url": "http://a.com"}},
+        {"id": "http_b", "type": "http_request", "config": {"url": "http://b.com"}},
+        {"id": "end", "type": "end", "config": {"outputs": [{"name": "result", "value": "{{ http_output }}"}]}},
+    ],
+    "edges": [
+        {"id": "e1", "source": "start", "target": "http_a"},
+        {"id": "e2", "source": "http_a", "target": "http_b"},
+        {"id": "e3", "source": "http_b", "target": "end"},
+    ],
+})
+
+# start fans out to two http nodes that both lead to end
+FAN_OUT_GRAPH = Graph.model_validate({
+    "nodes": [
+        {"id": "start", "type": "start", "config": {}},
+        {"id": "http_a", "type": "http_request", "config": {"url": "http://a.com"}},
+        {"id": "http_b", "type": "http_request", "config": {"url": "http://b.com"}},
+        {"id": "end", "type": "end", "config": {}},
+    ],
+    "edges": [
+        {"id": "e1", "source": "start", "target": "http_a"},
+        {"id": "e2", "source": "start", "target": "http_b"},
+        {"id": "e3", "source": "http_a", "target": "end"},
+        {"id": "e4", "source": "http_b", "target": "end"},
+    ],
+})
+
+@pytest.mark.parametrize("graph", [
+    pytest.param(SAMPLE_GRAPH, id="single_node"),
+    pytest.param(LONG_CHAIN_GRAPH, id="long_chain"),
+])
+def test_specialized_execution_matches_general(monkeypatch, graph):
+    """
+    Tests that the straight-line runner of a chain graph produces the same final
+    state as the compiled LangGraph app.
+    """
+    monkeypatch.setattr(HttpRequestNode, "execute", _ExecuteStub({"http_output": "mocked_response"}))
+    compiler = GraphCompiler.from_parsed(graph)
+
+    run = compiler.compile_specialized()
+    general = compiler.compile().invoke({"x": 1}, config={"configurable": {"thread_id": f"test_specialized_{id(graph)}"}})
+
+    assert run is not None
+    assert run({"x": 1}) == general
+
+def test_specialized_declines_non_chain_graphs():
+    """
+    Tests that graphs with fan-out are left to the general compiled path.
+    """
+    assert GraphCompiler.from_parsed(FAN_OUT_GRAPH).compile_specialized() is None
+
 class TestStateReducer:
     """状态reducer单元测试"""
     
@@ -125,42 +278,65 @@ class TestStateReducer:
         assert final_state["output1"] == "result1" 
         assert final_state["output2"] == "result2"
 
+    def test_batched_updates(self):
+        """测试一次合并多个更新"""
+        initial_state = {"user": "test"}
+        updates = [{"output1": "result1"}, {"output2": "result2", "user": "updated"}]
+        
+        final_state = state_reducer(initial_state, updates)
+        
+        assert final_state == state_reducer(state_reducer(initial_state, updates[0]), updates[1])
+        assert final_state == state_reducer(initial_state, {"__updates__": updates})
+        assert final_state["user"] == "updated"
+        assert initial_state == {"user": "test"}
+
+
+TEST_PAYLOAD_PATH = Path(__file__).parent.parent / "test_payload.json"
+
+def _load_min_dsl(path):
+    """Load only node ids and types, enough for start/end node lookups."""
+    nodes = orjson.loads(path.read_bytes())["nodes"]
+    return {"nodes": [{"id": node["id"], "type": node["type"]} for node in nodes], "edges": []}
+
 
 class TestGraphCompilerAdvanced:
     """图编译器高级单元测试"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def test_payload(self):
-        """加载测试payload"""
-        payload_path = Path(__file__).parent.parent / "test_payload.json"
-        with open(payload_path, 'r') as f:
-            return json.load(f)
+        """加载测试payload（整个会话只读取一次）"""
+        return orjson.loads(TEST_PAYLOAD_PATH.read_bytes())
+    
+    @pytest.fixture(scope="session")
+    def lookup_compiler(self):
+        """只含节点id和类型的编译器，用于start/end节点查找"""
+        return GraphCompiler(_load_min_dsl(TEST_PAYLOAD_PATH))
     
-    def test_compiler_initialization(self, test_payload):
+    @pytest.fixture(scope="session")
+    def compiler(self, test_payload):
+        """共享的编译器实例；以下测试只调用不修改状态的方法"""
+        return GraphCompiler(test_payload)
+    
+    def test_compiler_initialization(self, compiler, test_payload):
         """测试编译器初始化"""
-        compiler = GraphCompiler(test_payload)
-        
         assert compiler.graph_dsl == test_payload
         assert compiler.parsed_graph is not None
         assert len(compiler.nodes) == 4
     
-    def test_get_start_node(self, test_payload):
+    def test_get_start_node(self, lookup_compiler):
         """测试获取start节点"""
-        compiler = GraphCompiler(test_payload)
-        start_node = compiler._get_start_node()
+        start_node = lookup_compiler._get_start_node()
         
         assert start_node == "start_1"
     
-    def test_get_end_node(self, test_payload):
+    def test_get_end_node(self, lookup_compiler):
         """测试获取end节点"""
-        compiler = GraphCompiler(test_payload)
-        end_node = compiler._get_end_node()
+        end_node = lookup_compiler._get_end_node()
         
         assert end_node == "end_1"
     
-    def test_topological_sort(self, test_payload):
+    def test_topological_sort(self, compiler):
         """测试拓扑排序"""
-        compiler = GraphCompiler(test_payload)
         topo_order = compiler._topological_sort()
         
         assert len(topo_order) == 4
@@ -169,9 +345,7 @@ class TestGraphCompilerAdvanced:
         assert topo_order.index("agent_3") < topo_order.index("end_1")
         assert topo_order.index("agent_4") < topo_order.index("end_1")
     
-    def test_validate_graph_structure(self, test_payload):
+    def test_validate_graph_structure(self, compiler):
         """测试图结构验证"""
-        compiler = GraphCompiler(test_payload)
-        
         # 应该不抛出异常
-        compiler._validate_graph_structure() 
\ No newline at end of file
+        compiler._validate_graph_structure() 
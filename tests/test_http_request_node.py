@@ -1,88 +1,116 @@
+import json
 import pytest
-import respx
+import httpx
 from httpx import Response
+from gragraf.nodes import http_request
 from gragraf.nodes.http_request import HttpRequestNode, HttpRequestConfig
 
-@respx.mock
-def test_http_request_node_get_success():
+DATA_JSON = {"message": "Success"}
+SUBMIT_BODY = {"key": "value"}
+SUBMIT_JSON = {"status": "created"}
+USER_JSON = {"user": "test_user"}
+STATIC_JSON = {"message": "static content"}
+
+# (method, url) -> response factory; each call builds a fresh response, since
+# streamed bodies are single-use.
+ROUTES = {
+    ("GET", "https://api.example.com/data"): lambda request: Response(200, json=DATA_JSON),
+    ("POST", "https://api.example.com/submit"): lambda request: (
+        Response(201, json=SUBMIT_JSON) if json.loads(request.content) == SUBMIT_BODY else Response(400)
+    ),
+    ("GET", "http://test.com/fail"): lambda request: Response(500, text="Internal Server Error"),
+    ("GET", "http://test.com/users/123"): lambda request: Response(200, json=USER_JSON),
+    ("GET", "http://test.com/static"): lambda request: Response(200, json=STATIC_JSON),
+    ("GET", "http://test.com/large"): lambda request: Response(200, content=b"x" * 2048),
+    ("GET", "http://test.com/stream"): lambda request: Response(200, content=iter([b"x" * 600, b"y" * 600])),
+    ("GET", "http://test.com/login"): lambda request: Response(
+        200, json=STATIC_JSON, headers={"set-cookie": "session=alice-secret; Path=/"}
+    ),
+    ("GET", "http://test.com/whoami"): lambda request: Response(200, json={"cookie": request.headers.get("cookie")}),
+}
+
+def _handler(request: httpx.Request) -> Response:
+    route = ROUTES.get((request.method, str(request.url)))
+    return route(request) if route is not None else Response(404)
+
+@pytest.fixture(scope="module")
+def http_client():
+    """A client whose transport answers from ROUTES without touching the network."""
+    with httpx.Client(transport=httpx.MockTransport(_handler)) as client:
+        yield client
+
+# (config fields, state, expected output) for requests that succeed
+SUCCESS_CASES = [
+    pytest.param({"url": "https://api.example.com/data", "method": "GET"}, {}, DATA_JSON, id="get"),
+    pytest.param({"url": "https://api.example.com/submit", "method": "POST", "body": SUBMIT_BODY}, {}, SUBMIT_JSON, id="post_json_body"),
+    pytest.param({"url": "http://test.com/users/{{user_id}}", "method": "GET"}, {"user_id": 123}, USER_JSON, id="templated_url"),
+    pytest.param({"url": "http://test.com/static", "method": "GET"}, {}, STATIC_JSON, id="static_url"),
+]
+
+# (config fields, expected error fragment) for requests that fail
+ERROR_CASES = [
+    pytest.param({"url": "http://test.com/fail"}, "500", id="http_500"),
+    pytest.param({"url": "http://test.com/large", "max_response_bytes": 1024}, "too large", id="oversized_content_length"),
+    pytest.param({"url": "http://test.com/stream", "max_response_bytes": 1024}, "too large", id="oversized_streamed_body"),
+]
+
+@pytest.mark.parametrize("config_fields,state,expected", SUCCESS_CASES)
+def test_http_request_node_success(http_client, config_fields, state, expected):
     """
-    Tests that the HttpRequestNode successfully performs a GET request
-    and returns the JSON response.
+    Tests that GET and JSON-body POST requests, with templated or static URLs,
+    return the JSON response under the output key.
     """
-    url = "https://api.example.com/data"
-    response_json = {"message": "Success"}
-    respx.get(url).respond(200, json=response_json)
+    node = HttpRequestNode("http_node", HttpRequestConfig(**config_fields), client=http_client)
 
-    config = HttpRequestConfig(url=url, method="GET")
-    node = HttpRequestNode("http_node_1", config)
-
-    result = node.execute({})
+    result = node.execute(state)
 
-    assert result == {"http_node_1_output": response_json}
+    assert result == {"http_node_output": expected}
 
-@respx.mock
-def test_http_request_node_post_success():
+@pytest.mark.parametrize("config_fields,error_fragment", ERROR_CASES)
+def test_http_request_node_errors(http_client, config_fields, error_fragment):
     """
-    Tests that the HttpRequestNode can perform a POST request with a JSON body.
+    Tests that HTTP errors and responses over the size limit are reported
+    under the error key.
     """
-    url = "https://api.example.com/submit"
-    request_body = {"key": "value"}
-    response_body = {"status": "created"}
-    respx.post(url, json=request_body).respond(201, json=response_body)
-
-    config = HttpRequestConfig(url=url, method="POST", body=request_body)
-    node = HttpRequestNode("http_node_2", config)
+    node = HttpRequestNode("http_node", HttpRequestConfig(**config_fields), client=http_client)
 
     result = node.execute({})
 
-    assert result == {"http_node_2_output": response_body}
+    assert "http_node_error" in result
+    assert error_fragment in result["http_node_error"]
 
-@respx.mock
-def test_http_request_node_failure():
+def test_http_request_node_leaves_injected_client_open(http_client):
     """
-    Tests that the HttpRequestNode handles HTTP errors correctly.
+    Tests that an injected client is reused across executions rather than closed.
     """
-    url = "http://test.com/fail"
-    respx.get(url).respond(500, text="Internal Server Error")
-    
-    config = HttpRequestConfig(url=url, method="GET")
-    node = HttpRequestNode("http_node_3", config)
-    
-    result = node.execute({})
+    node = HttpRequestNode("http_node_8", HttpRequestConfig(url="http://test.com/static"), client=http_client)
+
+    node.execute({})
 
-    assert "http_node_3_error" in result
-    assert "500" in result["http_node_3_error"]
+    assert not http_client.is_closed
+    assert node.execute({}) == {"http_node_8_output": STATIC_JSON}
 
-@respx.mock
-def test_http_request_node_templating():
+def test_client_reuse(http_client, monkeypatch):
     """
-    Tests that the URL is correctly templated using the state.
+    Tests that nodes without an injected client share the pooled client for their
+    verify_ssl setting.
     """
-    url_template = "http://test.com/users/{{user_id}}"
-    response_json = {"user": "test_user"}
-    
-    respx.get("http://test.com/users/123").respond(200, json=response_json)
-
-    config = HttpRequestConfig(url=url_template, method="GET")
-    node = HttpRequestNode("http_node_4", config)
-    
-    state = {"user_id": 123}
-    result = node.execute(state)
+    monkeypatch.setitem(http_request._SHARED_CLIENTS, True, http_client)
+    nodes = [HttpRequestNode(f"http_node_{i}", HttpRequestConfig(url="http://test.com/static")) for i in range(2)]
 
-    assert result == {"http_node_4_output": response_json}
+    assert [node.execute({}) for node in nodes] == [{f"http_node_{i}_output": STATIC_JSON} for i in range(2)]
+    assert http_request._shared_client(True) is http_client
 
-@respx.mock
-def test_http_request_node_no_template_in_url():
+def test_shared_client_does_not_keep_cookies(monkeypatch):
     """
-    Tests that a URL without a template is handled correctly.
+    Tests that a cookie set by one request through the shared client is not sent
+    on the next, unrelated request.
     """
-    url = "http://test.com/static"
-    response_json = {"message": "static content"}
-    respx.get(url).respond(200, json=response_json)
+    shared = http_request._new_shared_client(True, transport=httpx.MockTransport(_handler))
+    monkeypatch.setitem(http_request._SHARED_CLIENTS, True, shared)
 
-    config = HttpRequestConfig(url=url, method="GET")
-    node = HttpRequestNode("http_node_5", config)
-    
-    result = node.execute({})
+    HttpRequestNode("login", HttpRequestConfig(url="http://test.com/login")).execute({})
+    result = HttpRequestNode("whoami", HttpRequestConfig(url="http://test.com/whoami")).execute({})
 
-    assert result == {"http_node_5_output": response_json} 
\ No newline at end of file
+    shared.close()
+    assert result == {"whoami_output": {"cookie": None}}
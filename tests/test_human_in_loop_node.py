@@ -1,13 +1,26 @@
 import pytest
+from functools import lru_cache
+from pydantic import ValidationError
 from src.gragraf.nodes.human_in_loop import HumanInLoopNode, HumanInLoopConfig
 
 
+@lru_cache(maxsize=256)
+def _config_for(**kwargs) -> HumanInLoopConfig:
+    """Build each distinct config once; frozen configs are safe to share between tests."""
+    return HumanInLoopConfig(**kwargs)
+
+
 class TestHumanInLoopNode:
     """Test cases for Human-in-Loop node functionality."""
 
+    @pytest.fixture(scope="class")
+    def default_node(self):
+        """Node with a plain message, shared by tests that only read it."""
+        return HumanInLoopNode("hilp_1", _config_for(message="Please approve"))
+
     def test_init(self):
         """Test node initialization."""
-        config = HumanInLoopConfig(
+        config = _config_for(
             message="Please approve this action",
             approval_label="Approve",
             rejection_label="Reject"
@@ -19,9 +32,18 @@ class TestHumanInLoopNode:
         assert node.config.approval_label == "Approve"
         assert node.config.rejection_label == "Reject"
 
+    def test_config_is_frozen_and_hashable(self):
+        """Test that configs reject mutation and can be used as cache keys."""
+        config = _config_for(message="Please approve")
+        
+        with pytest.raises(ValidationError):
+            config.message = "changed"
+        assert hash(config) == hash(HumanInLoopConfig(message="Please approve"))
+        assert _config_for(message="Please approve") is config
+
     def test_execute_triggers_interrupt_without_human_input(self):
         """Test that node triggers interrupt when no human input is available."""
-        config = HumanInLoopConfig(
+        config = _config_for(
             message="Please review this request",
             input_label="Comments",
             approval_label="Approve",
@@ -44,11 +66,8 @@ class TestHumanInLoopNode:
         assert hilp_info["type"] == "human_in_loop_interrupt"
         assert hilp_info["require_comment"] is True
 
-    def test_execute_with_human_approval(self):
+    def test_execute_with_human_approval(self, default_node):
         """Test execution when human provides approval."""
-        config = HumanInLoopConfig(message="Please approve")
-        node = HumanInLoopNode("hilp_1", config)
-        
         # State with human input
         state = {
             "previous_data": "some data",
@@ -58,7 +77,7 @@ class TestHumanInLoopNode:
             }
         }
         
-        result = node.execute(state)
+        result = default_node.execute(state)
         
         # Should contain decision and comment
         assert result["hilp_1_decision"] == "approve"
@@ -66,11 +85,8 @@ class TestHumanInLoopNode:
         assert result["hilp_1_user_input"]["decision"] == "approve"
         assert "__interrupt__" not in result
 
-    def test_execute_with_human_rejection(self):
+    def test_execute_with_human_rejection(self, default_node):
         """Test execution when human provides rejection."""
-        config = HumanInLoopConfig(message="Please review")
-        node = HumanInLoopNode("hilp_1", config)
-        
         # State with human rejection
         state = {
             "previous_data": "some data",
@@ -80,25 +96,22 @@ class TestHumanInLoopNode:
             }
         }
         
-        result = node.execute(state)
+        result = default_node.execute(state)
         
         # Should contain rejection decision
         assert result["hilp_1_decision"] == "reject"
         assert result["hilp_1_comment"] == "Not ready yet"
         assert "__interrupt__" not in result
 
-    def test_execute_with_existing_decision(self):
+    def test_execute_with_existing_decision(self, default_node):
         """Test that node returns existing decision if already made."""
-        config = HumanInLoopConfig(message="Please approve")
-        node = HumanInLoopNode("hilp_1", config)
-        
         # State with existing decision
         state = {
             "previous_data": "some data",
             "hilp_1_decision": "approve"
         }
         
-        result = node.execute(state)
+        result = default_node.execute(state)
         
         # Should return existing decision without triggering interrupt
         assert result["hilp_1_decision"] == "approve"
@@ -106,7 +119,7 @@ class TestHumanInLoopNode:
 
     def test_execute_handles_template_errors_gracefully(self):
         """Test that template errors are handled gracefully."""
-        config = HumanInLoopConfig(message="{{undefined_var}}")  # Undefined variable
+        config = _config_for(message="{{undefined_var}}")  # Undefined variable
         node = HumanInLoopNode("hilp_1", config)
         
         state = {"some_data": "value"}
@@ -120,50 +133,38 @@ class TestHumanInLoopNode:
         hilp_info = result["hilp_1_hilp_info"]
         assert "ERROR" in hilp_info["message"]
 
-    def test_get_decision_approval_mapping(self):
+    def test_get_decision_approval_mapping(self, default_node):
         """Test decision mapping for approval path."""
-        config = HumanInLoopConfig()
-        node = HumanInLoopNode("hilp_1", config)
-        
         state = {"hilp_1_decision": "approve"}
-        decision = node.get_decision(state)
+        decision = default_node.get_decision(state)
         
         assert decision == "approval"
 
-    def test_get_decision_rejection_mapping(self):
+    def test_get_decision_rejection_mapping(self, default_node):
         """Test decision mapping for rejection path."""
-        config = HumanInLoopConfig()
-        node = HumanInLoopNode("hilp_1", config)
-        
         state = {"hilp_1_decision": "rejected"}
-        decision = node.get_decision(state)
+        decision = default_node.get_decision(state)
         
         assert decision == "rejection"
 
-    def test_get_decision_default_to_rejection(self):
+    def test_get_decision_default_to_rejection(self, default_node):
         """Test that unknown decisions default to rejection."""
-        config = HumanInLoopConfig()
-        node = HumanInLoopNode("hilp_1", config)
-        
         # No decision in state
         state = {"some_data": "value"}
-        decision = node.get_decision(state)
+        decision = default_node.get_decision(state)
         
         assert decision == "rejection"
 
-    def test_get_decision_invalid_decision(self):
+    def test_get_decision_invalid_decision(self, default_node):
         """Test that invalid decisions map to error path."""
-        config = HumanInLoopConfig()
-        node = HumanInLoopNode("hilp_1", config)
-        
         state = {"hilp_1_decision": "invalid_decision"}
-        decision = node.get_decision(state)
+        decision = default_node.get_decision(state)
         
         assert decision == "error_path"
 
     def test_template_rendering_in_config(self):
         """Test that template variables are rendered in configuration."""
-        config = HumanInLoopConfig(
+        config = _config_for(
             message="Please review request for {{user_name}}"
         )
         node = HumanInLoopNode("hilp_1", config)
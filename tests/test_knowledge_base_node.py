@@ -1,135 +1,184 @@
+import os
 import pytest
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
+from pydantic import ValidationError
 from gragraf.nodes.knowledge_base import KnowledgeBaseNode, KnowledgeBaseConfig
 from langchain_core.documents import Document
 
-@pytest.fixture
+# Module-scoped patches and node cache are per process; under pytest-xdist keep
+# the module on one worker so they are set up once
+pytestmark = pytest.mark.xdist_group("knowledge_base")
+
+@pytest.fixture(scope="module", autouse=True)
+def kb_mocks(request):
+    """
+    Patches the embeddings, vector store and web loader once for the module,
+    with a fake API key in the environment.
+    """
+    patchers = {
+        "embeddings": patch('gragraf.nodes.knowledge_base.OpenAIEmbeddings'),
+        "faiss": patch('gragraf.nodes.knowledge_base.FAISS'),
+        "web": patch('gragraf.nodes.knowledge_base.WebBaseLoader'),
+    }
+    mocks = {}
+    for name, patcher in patchers.items():
+        mocks[name] = patcher.start()
+        request.addfinalizer(patcher.stop)
+    env_patcher = patch.dict(os.environ, {"OPENAI_API_KEY": "fake_api_key"})
+    env_patcher.start()
+    request.addfinalizer(env_patcher.stop)
+    return SimpleNamespace(**mocks)
+
+@pytest.fixture(autouse=True)
+def _reset_kb_mocks(kb_mocks):
+    """Clear calls and configured results left by the previous test."""
+    for mock in vars(kb_mocks).values():
+        mock.reset_mock(return_value=True, side_effect=True)
+
+@pytest.fixture(scope="module")
+def make_node(kb_mocks):
+    """
+    Builds one node per distinct config for the module. Only for tests that leave
+    the node untouched; tests that replace node attributes build their own node.
+    """
+    cache = {}
+    def _make(config):
+        key = config.model_dump_json()
+        if key not in cache:
+            cache[key] = KnowledgeBaseNode("kb_1", config)
+        return cache[key]
+    return _make
+
+@pytest.fixture(scope="session")
 def mock_retriever():
-    """Mocks the vector store retriever."""
+    """Mocks the vector store retriever; the retrieved documents are read-only stubs."""
     retriever = MagicMock()
     retriever.invoke.return_value = [
-        MagicMock(
+        SimpleNamespace(
             page_content="Paris is the capital of France.",
             metadata={"source": "test_doc", "type": "text"}
         )
     ]
     return retriever
 
-@patch('gragraf.nodes.knowledge_base.OpenAIEmbeddings')
-@patch('gragraf.nodes.knowledge_base.FAISS')
-def test_knowledge_base_node_with_documents(mock_faiss, mock_embeddings):
-    """
-    Tests successful document retrieval from text documents.
-    """
-    # Mock the retriever and its response
-    mock_retriever = MagicMock()
-    mock_retriever.invoke.return_value = [
-        MagicMock(
-            page_content="Paris is the capital of France.",
-            metadata={"source": "document_0", "type": "text"}
-        )
+def called_once_with(mock, *args, **kwargs):
+    """Whether the mock was called exactly once, with exactly these arguments."""
+    return mock.call_count == 1 and mock.call_args.args == args and mock.call_args.kwargs == kwargs
+
+def _wire_faiss(mock_faiss, page_contents, metadata_list):
+    """Make the patched FAISS store hand out a retriever returning the given documents."""
+    retriever = MagicMock()
+    retriever.invoke.return_value = [
+        SimpleNamespace(page_content=content, metadata=metadata)
+        for content, metadata in zip(page_contents, metadata_list)
     ]
-    
-    # Mock the FAISS vector store to return our mock retriever
-    mock_vector_store = MagicMock()
-    mock_vector_store.as_retriever.return_value = mock_retriever
-    mock_faiss.from_documents.return_value = mock_vector_store
-    
-    # Configure the node with documents
-    config = KnowledgeBaseConfig(
-        documents=["France is a country in Europe. Paris is its capital."], 
-        query="What is the capital of France?",
-        top_k=2
-    )
-    
-    # We patch os.getenv to avoid needing a real API key
-    with patch('os.getenv', return_value='fake_api_key'):
-        node = KnowledgeBaseNode("kb_1", config)
+    vector_store = MagicMock()
+    vector_store.as_retriever.return_value = retriever
+    mock_faiss.from_documents.return_value = vector_store
+    return retriever
 
-    # Execute the node
-    result = node.execute({})
-    
-    # Assertions
-    mock_retriever.invoke.assert_called_once_with("What is the capital of France?")
-    assert "kb_1_output" in result
-    assert len(result["kb_1_output"]) == 1
-    assert result["kb_1_output"][0]["content"] == "Paris is the capital of France."
-
-@patch('gragraf.nodes.knowledge_base.OpenAIEmbeddings')
-@patch('gragraf.nodes.knowledge_base.FAISS')
-@patch('gragraf.nodes.knowledge_base.WebBaseLoader')
-def test_knowledge_base_node_with_urls(mock_web_loader, mock_faiss, mock_embeddings):
+# Configs are frozen, so they are validated once here and shared by tests
+EMPTY_CONFIG = KnowledgeBaseConfig(
+    query="What is the capital of France?",
+    top_k=2
+)
+TEMPLATED_CONFIG = KnowledgeBaseConfig(
+    urls=["https://example.com/{{url_param}}"],
+    documents=["Document with {{doc_var}}"],
+    query="Search for {{search_term}}",
+    top_k=2
+)
+DUPLICATE_DOCS_CONFIG = KnowledgeBaseConfig(
+    documents=["Paris is the capital of France.", "Paris is the capital of France."],
+    query="What is the capital of France?"
+)
+
+# Retrieval scenarios: node config, optional web loader result or error, optional
+# text splitter output, and the documents the retriever returns
+RETRIEVAL_CASES = {
+    "documents": {
+        "config": KnowledgeBaseConfig(
+            documents=["France is a country in Europe. Paris is its capital."],
+            query="What is the capital of France?",
+            top_k=2
+        ),
+        "retrieved": [("Paris is the capital of France.", {"source": "document_0", "type": "text"})],
+    },
+    "urls": {
+        "config": KnowledgeBaseConfig(
+            urls=["https://example.com/python"],
+            query="What is Python?",
+            top_k=1
+        ),
+        "loaded": [
+            Document(
+                page_content="This is content from a website about Python programming.",
+                metadata={"source": "https://example.com/python"}
+            )
+        ],
+        "split": [
+            Document(
+                page_content="Python is a programming language.",
+                metadata={"source": "https://example.com/python"}
+            )
+        ],
+        "retrieved": [("Python is a programming language.", {"source": "https://example.com/python"})],
+    },
+    "url_loading_error": {
+        "config": KnowledgeBaseConfig(
+            urls=["https://invalid-url.com"],
+            query="What is this?",
+            top_k=1
+        ),
+        "load_error": Exception("Network error"),
+        "split": [
+            Document(
+                page_content="Error loading document from https://invalid-url.com: Network error",
+                metadata={"source": "https://invalid-url.com", "error": True}
+            )
+        ],
+        "retrieved": [("Error occurred", {"source": "https://invalid-url.com", "error": True})],
+    },
+}
+
+@pytest.mark.parametrize("case", list(RETRIEVAL_CASES))
+def test_knowledge_base_node_retrieval(kb_mocks, case):
     """
-    Tests successful document retrieval from URLs.
+    Tests document retrieval from text documents and URLs, including URL loading
+    errors, which must not raise.
     """
-    # Mock the web loader
-    mock_loader_instance = MagicMock()
-    mock_loader_instance.load.return_value = [
-        Document(
-            page_content="This is content from a website about Python programming.",
-            metadata={"source": "https://example.com/python"}
-        )
-    ]
-    mock_web_loader.return_value = mock_loader_instance
-    
-    # Mock the text splitter
-    mock_text_splitter = MagicMock()
-    mock_text_splitter.split_documents.return_value = [
-        Document(
-            page_content="Python is a programming language.",
-            metadata={"source": "https://example.com/python"}
-        )
-    ]
-    
-    # Mock the retriever
-    mock_retriever = MagicMock()
-    mock_retriever.invoke.return_value = [
-        MagicMock(
-            page_content="Python is a programming language.",
-            metadata={"source": "https://example.com/python"}
-        )
-    ]
-    
-    # Mock the FAISS vector store
-    mock_vector_store = MagicMock()
-    mock_vector_store.as_retriever.return_value = mock_retriever
-    mock_faiss.from_documents.return_value = mock_vector_store
-    
-    # Configure the node with URLs
-    config = KnowledgeBaseConfig(
-        urls=["https://example.com/python"],
-        query="What is Python?",
-        top_k=1
-    )
-    
-    with patch('os.getenv', return_value='fake_api_key'):
-        node = KnowledgeBaseNode("kb_1", config)
-        # Mock the text splitter
-        node.text_splitter = mock_text_splitter
+    spec = RETRIEVAL_CASES[case]
+    config = spec["config"]
+    
+    if "loaded" in spec:
+        kb_mocks.web.return_value.load.return_value = spec["loaded"]
+    if "load_error" in spec:
+        kb_mocks.web.side_effect = spec["load_error"]
+    contents, metadata_list = zip(*spec["retrieved"])
+    retriever = _wire_faiss(kb_mocks.faiss, contents, metadata_list)
+    
+    # A fresh node: the text splitter may be swapped out below
+    node = KnowledgeBaseNode("kb_1", config)
+    if "split" in spec:
+        node.text_splitter = MagicMock()
+        node.text_splitter.split_documents.return_value = spec["split"]
 
-    # Execute the node
     result = node.execute({})
     
-    # Assertions
-    mock_web_loader.assert_called_once_with(["https://example.com/python"])
-    mock_loader_instance.load.assert_called_once()
-    mock_retriever.invoke.assert_called_once_with("What is Python?")
-    assert "kb_1_output" in result
-
-@patch('gragraf.nodes.knowledge_base.OpenAIEmbeddings')
-@patch('gragraf.nodes.knowledge_base.FAISS')
-def test_knowledge_base_node_no_documents(mock_faiss, mock_embeddings):
+    if config.urls:
+        assert called_once_with(kb_mocks.web, config.urls)
+    if "loaded" in spec:
+        assert kb_mocks.web.return_value.load.call_count == 1
+    assert called_once_with(retriever.invoke, config.query)
+    assert [doc["content"] for doc in result["kb_1_output"]] == list(contents)
+
+def test_knowledge_base_node_no_documents(make_node):
     """
     Tests behavior when no documents are provided.
     """
     # Configure the node with no documents or URLs
-    config = KnowledgeBaseConfig(
-        query="What is the capital of France?",
-        top_k=2
-    )
-    
-    with patch('os.getenv', return_value='fake_api_key'):
-        node = KnowledgeBaseNode("kb_1", config)
+    node = make_node(EMPTY_CONFIG)
 
     # Execute the node
     result = node.execute({})
@@ -137,57 +186,6 @@ def test_knowledge_base_node_no_documents(mock_faiss, mock_embeddings):
     # Should return empty results
     assert result == {"kb_1_output": []}
 
-@patch('gragraf.nodes.knowledge_base.OpenAIEmbeddings')
-@patch('gragraf.nodes.knowledge_base.FAISS')
-@patch('gragraf.nodes.knowledge_base.WebBaseLoader')
-def test_knowledge_base_node_url_loading_error(mock_web_loader, mock_faiss, mock_embeddings):
-    """
-    Tests handling of URL loading errors.
-    """
-    # Mock the web loader to raise an exception
-    mock_web_loader.side_effect = Exception("Network error")
-    
-    # Mock the text splitter
-    mock_text_splitter = MagicMock()
-    mock_text_splitter.split_documents.return_value = [
-        Document(
-            page_content="Error loading document from https://invalid-url.com: Network error",
-            metadata={"source": "https://invalid-url.com", "error": True}
-        )
-    ]
-    
-    # Mock the retriever
-    mock_retriever = MagicMock()
-    mock_retriever.invoke.return_value = [
-        MagicMock(
-            page_content="Error occurred",
-            metadata={"source": "https://invalid-url.com", "error": True}
-        )
-    ]
-    
-    # Mock the FAISS vector store
-    mock_vector_store = MagicMock()
-    mock_vector_store.as_retriever.return_value = mock_retriever
-    mock_faiss.from_documents.return_value = mock_vector_store
-    
-    # Configure the node with invalid URL
-    config = KnowledgeBaseConfig(
-        urls=["https://invalid-url.com"],
-        query="What is this?",
-        top_k=1
-    )
-    
-    with patch('os.getenv', return_value='fake_api_key'):
-        node = KnowledgeBaseNode("kb_1", config)
-        # Mock the text splitter
-        node.text_splitter = mock_text_splitter
-
-    # Execute the node - should not raise exception
-    result = node.execute({})
-    
-    # Should still return results (error documents)
-    assert "kb_1_output" in result
-
 def test_knowledge_base_config_validation():
     """
     Tests configuration validation for the knowledge base.
@@ -208,20 +206,16 @@ def test_knowledge_base_config_validation():
     assert config.top_k == 5
     assert config.chunk_size == 500
     assert config.chunk_overlap == 100
+    
+    # Configs are immutable once validated
+    with pytest.raises(ValidationError):
+        config.top_k = 1
 
-def test_knowledge_base_get_requirements():
+def test_knowledge_base_get_requirements(make_node):
     """
     Tests the get_requirements method for variable detection.
     """
-    config = KnowledgeBaseConfig(
-        urls=["https://example.com/{{url_param}}"],
-        documents=["Document with {{doc_var}}"],
-        query="Search for {{search_term}}",
-        top_k=2
-    )
-    
-    with patch('os.getenv', return_value='fake_api_key'):
-        node = KnowledgeBaseNode("kb_1", config)
+    node = make_node(TEMPLATED_CONFIG)
     
     requirements = node.get_requirements()
     
@@ -234,4 +228,19 @@ def test_knowledge_base_get_requirements():
     all_vars = set(requirements["all_variables"])
     assert "search_term" in all_vars
     assert "url_param" in all_vars
-    assert "doc_var" in all_vars 
\ No newline at end of file
+    assert "doc_var" in all_vars
+
+def test_knowledge_base_node_deduplicates_documents(kb_mocks, make_node):
+    """
+    Tests that identical chunks are embedded only once.
+    """
+    _wire_faiss(kb_mocks.faiss, [], [])
+    
+    node = make_node(DUPLICATE_DOCS_CONFIG)
+
+    node.execute({})
+    
+    embedded_docs = kb_mocks.faiss.from_documents.call_args[0][0]
+    assert len(embedded_docs) == 1
+    assert embedded_docs[0].metadata["source"] == "document_0"
+    assert embedded_docs[0].metadata["duplicate_sources"] == ["document_1"]
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Server Tests: Test startup, compile caching and streaming in gragraf.server
+"""
+
+import pytest
+import orjson
+import asyncio
+import functools
+from httpx import ASGITransport, AsyncClient
+
+from gragraf.server import app
+from gragraf.infrastructure.database import Base, DatabaseConfig, DatabaseManager
+from gragraf.infrastructure.repositories import RepositoryFactory
+
+
+@pytest.fixture
+async def client():
+    """In-process async client; /run/stream does not touch the database"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+def _post_json(client, url, obj):
+    """POST a body serialized with orjson instead of httpx's stdlib json encoding"""
+    return client.post(url, content=orjson.dumps(obj), headers={"Content-Type": "application/json"})
+
+
+class TestDatabaseStartup:
+    """Test startup schema check and pool warm-up"""
+
+    async def test_ensure_schema_skips_unchanged_schema(self, tmp_path):
+        """Test that DDL only runs when the stored schema hash differs"""
+        config = DatabaseConfig(database_url=f"sqlite+aiosqlite:///{tmp_path / 'startup.db'}")
+        db_manager = DatabaseManager(config)
+        try:
+            assert await db_manager.ensure_schema() is True
+            assert await db_manager.ensure_schema() is False
+            await db_manager.warm_pool()
+        finally:
+            await db_manager.close()
+
+    async def test_ensure_schema_recreates_missing_table(self, tmp_path):
+        """Test that a dropped model table is recreated even when the stored hash matches"""
+        from sqlalchemy import inspect
+
+        config = DatabaseConfig(database_url=f"sqlite+aiosqlite:///{tmp_path / 'startup.db'}")
+        db_manager = DatabaseManager(config)
+        try:
+            assert await db_manager.ensure_schema() is True
+            async with db_manager.get_async_engine().begin() as conn:
+                await conn.run_sync(Base.metadata.tables["workflows"].drop)
+
+            assert await db_manager.ensure_schema() is True
+            async with db_manager.get_async_engine().connect() as conn:
+                assert await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table("workflows"))
+        finally:
+            await db_manager.close()
+
+
+class TestCompileCache:
+    """Test compiled graph caching for /run/stream"""
+
+    async def test_same_dsl_reuses_compiled_graph(self):
+        """Test that an identical DSL is compiled only once"""
+        from gragraf.server import _get_compiled_graph, _COMPILE_CACHE
+        from gragraf.schemas.graph import Graph
+
+        dsl = Graph.model_validate({
+            "nodes": [
+                {"id": "start", "type": "start", "config": {}},
+                {"id": "end", "type": "end", "config": {"outputs": [{"name": "out", "value": "{{x}}"}]}}
+            ],
+            "edges": [{"id": "e1", "source": "start", "target": "end"}]
+        })
+        _COMPILE_CACHE.clear()
+
+        first = await _get_compiled_graph(dsl.model_dump_json())
+        second = await _get_compiled_graph(Graph.model_validate(dsl.model_dump()).model_dump_json())
+
+        assert first is second
+        assert len(_COMPILE_CACHE) == 1
+
+    async def test_startup_warms_active_workflows(self, tmp_path):
+        """Test that active workflows are compiled into the cache ahead of requests"""
+        from gragraf.server import _warm_compile_cache, _dsl_hash, _COMPILE_CACHE
+        from gragraf.application.services import WorkflowApplicationService
+        from gragraf.schemas.graph import Graph
+
+        dsl = {
+            "nodes": [
+                {"id": "start", "type": "start", "config": {}},
+                {"id": "end", "type": "end", "config": {"outputs": [{"name": "out", "value": "{{x}}"}]}}
+            ],
+            "edges": [{"id": "e1", "source": "start", "target": "end"}]
+        }
+        db_manager = DatabaseManager(DatabaseConfig(database_url=f"sqlite+aiosqlite:///{tmp_path / 'warm.db'}"))
+        try:
+            await db_manager.create_tables()
+            service = WorkflowApplicationService(RepositoryFactory(db_manager))
+            workflow = await service.create_workflow(name="warm", dsl=dsl)
+            await service.activate_workflow(workflow.id)
+            _COMPILE_CACHE.clear()
+
+            assert await _warm_compile_cache(db_manager) == 1
+            assert _dsl_hash(Graph.model_validate(dsl).model_dump_json()) in _COMPILE_CACHE
+        finally:
+            await db_manager.close()
+
+
+async def _chunk_stream(chunks, error=None):
+    for chunk in chunks:
+        yield chunk
+    if error is not None:
+        raise error
+
+
+class TestStreamBatching:
+    """Test coalescing of streamed progress chunks"""
+
+    async def test_chunks_are_batched_up_to_max_batch(self):
+        """Test that fast chunks are grouped into batches of at most max_batch"""
+        from gragraf.server import _batch_chunks
+
+        chunks = [{f"node_{i}": {}} for i in range(5)]
+        batches = [batch async for batch in _batch_chunks(_chunk_stream(chunks), max_batch=2, max_wait=1.0)]
+
+        assert batches == [chunks[0:2], chunks[2:4], chunks[4:5]]
+
+    async def test_interrupt_closes_batch(self):
+        """Test that an interrupt chunk flushes its batch immediately"""
+        from gragraf.server import _batch_chunks
+
+        chunks = [{"start": {}}, {"__interrupt__": ("paused",)}, {"after": {}}]
+        batches = [batch async for batch in _batch_chunks(_chunk_stream(chunks), max_wait=1.0)]
+
+        assert batches[0] == chunks[0:2]
+
+    async def test_stream_error_is_raised_after_pending_chunks(self):
+        """Test that a stream failure surfaces after earlier chunks are yielded"""
+        from gragraf.server import _batch_chunks
+
+        batches = []
+        with pytest.raises(RuntimeError, match="boom"):
+            async for batch in _batch_chunks(_chunk_stream([{"start": {}}], RuntimeError("boom"))):
+                batches.append(batch)
+
+        assert batches == [[{"start": {}}]]
+
+    async def test_closing_early_stops_producer(self):
+        """Test that closing the batch stream waits for its producer task to finish"""
+        from gragraf.server import _batch_chunks
+
+        async def endless():
+            while True:
+                yield {"tick": {}}
+                await asyncio.sleep(0)
+
+        tasks_before = asyncio.all_tasks()
+        batches = _batch_chunks(endless(), max_batch=1)
+        await anext(batches)
+        await batches.aclose()
+
+        assert asyncio.all_tasks() == tasks_before
+
+
+class TestStreamKeepAlive:
+    """Test SSE keep-alive pings"""
+
+    async def test_idle_stream_emits_ping_comments(self):
+        """Test that a ping comment is sent while waiting for a slow frame"""
+        from gragraf.server import _with_keepalive, _SSE_PING
+
+        async def slow_frames():
+            await asyncio.sleep(0.05)
+            yield b"data: {}\n\n"
+
+        frames = [frame async for frame in _with_keepalive(slow_frames(), interval=0.01)]
+
+        assert frames[0] == _SSE_PING
+        assert frames[-1] == b"data: {}\n\n"
+
+    async def test_stream_response_headers(self, client):
+        """Test that /run/stream is served as an unbuffered event stream"""
+        dsl = {
+            "nodes": [
+                {"id": "start", "type": "start", "config": {}},
+                {"id": "end", "type": "end", "config": {}}
+            ],
+            "edges": [{"id": "e1", "source": "start", "target": "end"}]
+        }
+
+        response = await _post_json(client, "/run/stream", {"dsl": dsl})
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.headers["x-accel-buffering"] == "no"
+        assert '"type":"complete"' in response.text
+
+    async def test_single_chunk_batches_keep_progress_event(self, client, monkeypatch):
+        """Test that a batch of one chunk is still sent as a 'progress' event with its data"""
+        from gragraf import server
+
+        monkeypatch.setattr(server, "_batch_chunks", functools.partial(server._batch_chunks, max_batch=1))
+        dsl = {
+            "nodes": [
+                {"id": "start", "type": "start", "config": {}},
+                {"id": "end", "type": "end", "config": {}}
+            ],
+            "edges": [{"id": "e1", "source": "start", "target": "end"}]
+        }
+
+        response = await _post_json(client, "/run/stream", {"dsl": dsl})
+        events = [orjson.loads(line[len("data: "):]) for line in response.text.splitlines() if line.startswith("data: ")]
+
+        progress = [event for event in events if event["type"] == "progress"]
+        assert [next(iter(event["data"])) for event in progress] == ["start", "end"]
+        assert not any(event["type"] == "progress_batch" for event in events)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,214 @@
+import pytest
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, ConfigDict
+from gragraf.utils.templating import (
+    _compile_template,
+    _simple_template,
+    env,
+    find_template_variables,
+    get_render_plan,
+    may_hold_templates,
+    render_config,
+    render_template_string,
+    warm_render_plan,
+)
+
+def test_render_template_string_substitutes_variables():
+    """
+    Tests that template variables are rendered from the state.
+    """
+    result = render_template_string("Hello {{name}}!", {"name": "World"})
+
+    assert result == "Hello World!"
+
+def test_render_template_string_without_template_syntax():
+    """
+    Tests that plain strings are returned unchanged.
+    """
+    assert render_template_string("plain text", {"name": "World"}) == "plain text"
+
+def test_render_template_string_undefined_variable():
+    """
+    Tests that an undefined variable renders to an empty string.
+    """
+    assert render_template_string("{{missing}}", {}) == ""
+
+def test_find_template_variables():
+    """
+    Tests that referenced variables are extracted from a template.
+    """
+    assert find_template_variables("{{a}} and {{ b }}") == {"a", "b"}
+
+def test_find_template_variables_returns_independent_sets():
+    """
+    Tests that callers can mutate the returned set without affecting the cache.
+    """
+    first = find_template_variables("{{a}}")
+    first.add("b")
+
+    assert find_template_variables("{{a}}") == {"a"}
+
+def test_compiled_templates_are_cached():
+    """
+    Tests that repeated renders of the same string reuse the compiled template.
+    """
+    template_string = "Cached {{value|string}} template"
+    render_template_string(template_string, {"value": 1})
+    misses = _compile_template.cache_info().misses
+
+    assert render_template_string(template_string, {"value": 2}) == "Cached 2 template"
+    assert _compile_template.cache_info().misses == misses
+
+@pytest.mark.parametrize("template_string", [
+    "Hello {{name}}!",
+    "{{ name }} and {{count}}",
+    "Line one\n{{name}}\n",
+    "{{items}} {{flag}} {{nothing}}",
+])
+def test_simple_substitution_matches_jinja(template_string):
+    """
+    Tests that the regex fast path renders exactly like Jinja.
+    """
+    state = {"name": "World", "count": 3, "items": [1, "a"], "flag": True, "nothing": None}
+
+    assert _simple_template(template_string) is not None
+    assert render_template_string(template_string, state) == env.from_string(template_string).render(state)
+
+@pytest.mark.parametrize("template_string", [
+    "{{name|upper}}",
+    "{{user.name}}",
+    "{% if name %}{{name}}{% endif %}",
+    "{{ true }}",
+    "{{- name }}",
+])
+def test_expressions_fall_back_to_jinja(template_string):
+    """
+    Tests that filters, attributes, statements and literals use the Jinja path.
+    """
+    assert _simple_template(template_string) is None
+
+class _NestedConfig(BaseModel):
+    title: str = ""
+    headers: Dict[str, str] = {}
+    items: List[str] = []
+    count: int = 0
+
+def test_render_config_renders_nested_templates():
+    """
+    Tests that templates inside dicts and lists are rendered.
+    """
+    config = _NestedConfig(
+        title="Report for {{user}}",
+        headers={"Authorization": "Bearer {{token}}", "Accept": "application/json"},
+        items=["static", "{{user}}"],
+        count=3,
+    )
+
+    rendered = render_config(config, {"user": "alice", "token": "secret"})
+
+    assert rendered.title == "Report for alice"
+    assert rendered.headers == {"Authorization": "Bearer secret", "Accept": "application/json"}
+    assert rendered.items == ["static", "alice"]
+    assert rendered.count == 3
+    assert config.title == "Report for {{user}}"
+
+def test_render_config_without_templates_returns_same_instance():
+    """
+    Tests that a config without template markers is returned as-is.
+    """
+    config = _NestedConfig(title="static", headers={"Accept": "text/plain"})
+
+    assert render_config(config, {"user": "alice"}) is config
+
+class _FrozenNestedConfig(_NestedConfig):
+    model_config = ConfigDict(frozen=True)
+
+def test_render_plan_is_cached_per_config():
+    """
+    Tests that the render plan only lists templated paths and is built once per frozen config.
+    """
+    config = _FrozenNestedConfig(title="{{a}}", headers={"X": "{{b}}", "Y": "plain"}, items=["{{c}}"])
+
+    plan = get_render_plan(config)
+
+    assert plan == [
+        (("title",), "{{a}}", False),
+        (("headers", "X"), "{{b}}", False),
+        (("items", 0), "{{c}}", False),
+    ]
+    assert get_render_plan(config) is plan
+
+def test_render_plan_follows_mutable_config_changes():
+    """
+    Tests that configs that are not frozen never render from a stale plan.
+    """
+    config = _NestedConfig(title="{{a}}")
+    assert render_config(config, {"a": "x", "b": "y"}).title == "x"
+
+    config.title = "{{b}}"
+
+    assert render_config(config, {"a": "x", "b": "y"}).title == "y"
+
+def test_warm_render_plan_precompiles_templates():
+    """
+    Tests that warming a config compiles its Jinja templates before the first render.
+    """
+    config = _NestedConfig(title="Warm {{ a|upper }}")
+
+    warm_render_plan(config)
+    misses = _compile_template.cache_info().misses
+
+    assert render_config(config, {"a": "x"}).title == "Warm X"
+    assert _compile_template.cache_info().misses == misses
+
+class _Inner(BaseModel):
+    value: str
+
+class _OuterConfig(BaseModel):
+    name: str
+    inner: List[_Inner] = []
+
+def test_render_config_renders_nested_models():
+    """
+    Tests that templates inside nested models are rendered through validation.
+    """
+    config = _OuterConfig(name="plain", inner=[_Inner(value="{{x}}"), _Inner(value="fixed")])
+
+    rendered = render_config(config, {"x": "done"})
+
+    assert isinstance(rendered.inner[0], _Inner)
+    assert [item.value for item in rendered.inner] == ["done", "fixed"]
+    assert config.inner[0].value == "{{x}}"
+
+class _NumericConfig(BaseModel):
+    retries: int = 3
+    timeout: Optional[float] = None
+    weights: List[float] = []
+
+def test_configs_without_string_fields_skip_rendering():
+    """
+    Tests that config classes that cannot hold strings are returned untouched.
+    """
+    config = _NumericConfig(weights=[0.5])
+
+    assert may_hold_templates(_NumericConfig) is False
+    assert may_hold_templates(_NestedConfig) is True
+    assert render_config(config, {"retries": 1}) is config
+
+class _AnyConfig(BaseModel):
+    payload: Any = None
+    extra: Optional[Any] = None
+    raw: object = None
+
+def test_configs_with_any_fields_render_templates():
+    """
+    Tests that Any and object fields are treated as possibly holding templates.
+    """
+    config = _AnyConfig(payload="Hello {{user}}", extra={"to": "{{user}}"}, raw="{{user}}")
+
+    rendered = render_config(config, {"user": "alice"})
+
+    assert may_hold_templates(_AnyConfig) is True
+    assert rendered.payload == "Hello alice"
+    assert rendered.extra == {"to": "alice"}
+    assert rendered.raw == "alice"